@@ -19,23 +19,49 @@ including O1, O3, O3-mini, and O4-mini. Features include:
 import os
 import sys
 import json
-import requests
+import atexit
+import hashlib
+import queue
+import shutil
+import threading
 import re
 import logging
+import logging.handlers
 import time
 from dataclasses import dataclass, asdict
-from typing import Optional, Generator, List, Dict, Any, Union
+from functools import cached_property
+from typing import TYPE_CHECKING, Optional, Generator, AsyncGenerator, List, Dict, Any, Union, Tuple
 from pathlib import Path
 from datetime import datetime
-from requests.exceptions import RequestException, HTTPError, Timeout
 
-from config import AgentConfig, ModelConfig
-from utils import ColorManager, FileHandler, SecurityManager
-from export import ConversationExporter
+if TYPE_CHECKING:
+    # requests is imported on first API call to keep CLI startup fast
+    import requests
+    # The exporter is only loaded by the code paths that use it
+    from export import ConversationExporter
+
+from config import AgentConfig, ModelConfig, load_config_file, save_config_file, now_iso
+from utils import (
+    ColorManager, FileHandler, SecurityManager, json_loads, json_dumps_line, read_history_file,
+    iter_history_file, repair_history_tail, history_meta, add_to_history_meta, save_history_meta, HistoryIndex, HISTORY_FTS_FILE
+)
 
 
 class UnifiedOpenAIAgent:
     """Unified OpenAI Agent supporting all reasoning models with advanced features"""
+    
+    # Number of appended messages between automatic history backups
+    BACKUP_INTERVAL = 500
+    
+    # Messages allowed past max_history_size before truncating in one batch
+    TRUNCATE_SLACK = 64
+    
+    # Response cache limits: entries kept, and seconds an entry stays usable
+    RESPONSE_CACHE_MAX_ENTRIES = 256
+    RESPONSE_CACHE_MAX_AGE = 7 * 24 * 3600
+    
+    # Log file handlers shared by every agent instance with the same id
+    _log_handler_cache: Dict[str, logging.Handler] = {}
 
     def __init__(self, agent_id: str, model: str = "o1"):
         """
@@ -47,14 +73,19 @@ class UnifiedOpenAIAgent:
         """
         self.agent_id = agent_id
         self.model = model
+        
+        # Model settings are constant for the agent's lifetime
+        self._model_config = ModelConfig.get_model_config(model)
+        self._model_display = self._model_config["name"]
+        self._reasoning_timeouts = self._model_config["reasoning_timeout"]
+        
         self.base_dir = Path(f"agents/{agent_id}")
+        self.history_file = self.base_dir / "history.jsonl"
         self.api_url = "https://api.openai.com/v1/chat/completions"
         
         # Initialize components
         self.colors = ColorManager()
-        self.file_handler = FileHandler()
         self.security = SecurityManager()
-        self.exporter = ConversationExporter()
         
         # Setup directories and logging
         self._setup_directories()
@@ -62,13 +93,50 @@ class UnifiedOpenAIAgent:
         
         # Load configuration and history
         self.config = self._load_config()
+        self._specialize_payload()
         self.messages = self._load_history()
+        self._appended_since_backup = 0
+        
+        # Summary of what history.jsonl holds, owned by the writer thread once it starts
+        self._history_meta = history_meta(self.messages)
+        
+        # History writes are applied in order by a background writer thread
+        self._io_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._io_thread = threading.Thread(
+            target=self._io_loop, name=f"history-writer-{agent_id}", daemon=True
+        )
+        self._io_thread.start()
+        self._io_queue.put(("meta", None))
+        atexit.register(self.close)
+        
+        # API-formatted view of the history, kept in sync by add_message
+        self._api_messages = self._build_api_messages()
+        
+        # Running statistics, kept in sync by add_message
+        self._stats = self._build_stats()
+        
+        # Lowercased message contents for search, built on first search
+        self._content_lower: Optional[List[str]] = None
+        
+        # Full-text index (history.fts.db), opened on first full-text search
+        self._history_index: Optional[HistoryIndex] = None
         
         # Setup API key
         self.api_key = self._get_api_key()
         
         self.logger.info(f"Initialized Unified OpenAI Agent: {agent_id} with model: {self.model}")
         
+    @cached_property
+    def file_handler(self) -> FileHandler:
+        """File handler, created on first use"""
+        return FileHandler()
+        
+    @cached_property
+    def exporter(self) -> "ConversationExporter":
+        """Conversation exporter, created on first use"""
+        from export import ConversationExporter
+        return ConversationExporter()
+        
     def _setup_directories(self):
         """Create necessary directory structure"""
         directories = [
@@ -76,7 +144,8 @@ class UnifiedOpenAIAgent:
             self.base_dir / "backups",
             self.base_dir / "logs",
             self.base_dir / "exports",
-            self.base_dir / "uploads"
+            self.base_dir / "uploads",
+            self.base_dir / "cache"
         ]
         
         for directory in directories:
@@ -84,8 +153,6 @@ class UnifiedOpenAIAgent:
             
     def _setup_logging(self):
         """Configure logging to file and console"""
-        log_file = self.base_dir / "logs" / f"{datetime.now().strftime('%Y-%m-%d')}.log"
-        
         # Create logger
         self.logger = logging.getLogger(f"UnifiedAgent_{self.agent_id}")
         self.logger.setLevel(logging.INFO)
@@ -93,18 +160,25 @@ class UnifiedOpenAIAgent:
         # Remove existing handlers
         self.logger.handlers.clear()
         
-        # File handler
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        file_handler.setFormatter(file_formatter)
+        # File handler, rotated daily and opened on the first record
+        file_handler = self._log_handler_cache.get(self.agent_id)
+        if file_handler is None:
+            file_handler = logging.handlers.TimedRotatingFileHandler(
+                self.base_dir / "logs" / "agent.log",
+                when="midnight", backupCount=14, encoding='utf-8', delay=True
+            )
+            file_formatter = logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            )
+            file_handler.setFormatter(file_formatter)
+            self._log_handler_cache[self.agent_id] = file_handler
         
         # Console handler with color support
         console_handler = logging.StreamHandler()
         console_formatter = logging.Formatter('%(levelname)s: %(message)s')
         console_handler.setFormatter(console_formatter)
-        console_handler.setLevel(logging.WARNING)
+        console_level = os.getenv("AGENT_CONSOLE_LOG_LEVEL", "WARNING").upper()
+        console_handler.setLevel(getattr(logging, console_level, logging.WARNING))
         
         self.logger.addHandler(file_handler)
         self.logger.addHandler(console_handler)
@@ -115,12 +189,12 @@ class UnifiedOpenAIAgent:
         
         if config_file.exists():
             try:
-                import yaml
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    config_data = yaml.safe_load(f)
-                    # Ensure model is set correctly
-                    config_data['model'] = self.model
-                    return AgentConfig(**config_data)
+                config_data = load_config_file(config_file, use_sidecar=True)
+                # What the file holds, so saving an unchanged config can be skipped
+                self._saved_config = self._config_content(config_data)
+                # Ensure model is set correctly
+                config_data['model'] = self.model
+                return AgentConfig(**config_data)
             except Exception as e:
                 self.logger.error(f"Error loading config: {e}")
                 return AgentConfig(model=self.model)
@@ -134,64 +208,232 @@ class UnifiedOpenAIAgent:
         if config is None:
             config = self.config
             
-        config.updated_at = datetime.now().isoformat()
+        # Nothing to write (or rebuild) when only the timestamps would change
+        config_data = asdict(config)
+        content = self._config_content(config_data)
+        if content == getattr(self, "_saved_config", None):
+            return
+            
+        config.updated_at = config_data["updated_at"] = now_iso()
         config_file = self.base_dir / "config.yaml"
         
         try:
-            import yaml
-            with open(config_file, 'w', encoding='utf-8') as f:
-                yaml.dump(asdict(config), f, default_flow_style=False, allow_unicode=True)
+            save_config_file(config_file, config_data, use_sidecar=True)
+            self._saved_config = content
         except Exception as e:
             self.logger.error(f"Error saving config: {e}")
             
+        # Rebuild the payload template when the active config changes
+        if config is getattr(self, "config", None):
+            self._specialize_payload()
+            
+    @staticmethod
+    def _config_content(config_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Config fields that matter for change detection (everything but the timestamps)"""
+        return {key: value for key, value in config_data.items() if key not in ("created_at", "updated_at")}
+        
     def _get_api_key(self) -> str:
         """Get API key using security manager"""
         return self.security.get_api_key(self.model, self.base_dir)
         
     def _load_history(self) -> List[Dict[str, Any]]:
-        """Load conversation history from history.json"""
-        history_file = self.base_dir / "history.json"
+        """Load conversation history from history.jsonl"""
+        if self.history_file.exists():
+            try:
+                # New appends must not be glued onto a line a crash left unterminated
+                torn = repair_history_tail(self.history_file)
+                if torn:
+                    torn_file = self._recovery_file("torn_line")
+                    torn_file.write_bytes(torn)
+                    self.logger.warning(f"Removed a torn last line from {self.history_file.name} (saved to {torn_file})")
+                return read_history_file(self.history_file)
+            except Exception as e:
+                # Move the file aside so later appends and compaction cannot replace it
+                try:
+                    moved = self._recovery_file("unreadable_history")
+                    os.replace(self.history_file, moved)
+                    self.logger.error(f"Error loading history: {e}; moved the file to {moved}")
+                except OSError as move_error:
+                    self.logger.error(f"Error loading history: {e}; could not move it aside: {move_error}")
+                return []
         
-        if history_file.exists():
+        # Migrate history saved by earlier versions as a single JSON array
+        legacy_file = self.base_dir / "history.json"
+        if legacy_file.exists():
             try:
-                with open(history_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                messages = read_history_file(legacy_file)
             except Exception as e:
-                self.logger.error(f"Error loading history: {e}")
+                self.logger.error(f"Error loading legacy history: {e}")
                 return []
+            self._write_history(messages)
+            self.logger.info(f"Migrated {len(messages)} messages from {legacy_file.name} to {self.history_file.name}")
+            return messages
         return []
         
-    def _save_history(self):
-        """Save conversation history to history.json with backup"""
-        history_file = self.base_dir / "history.json"
+    def _recovery_file(self, kind: str) -> Path:
+        """Path in backups/ for data set aside while loading (not part of the rolling backups)"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return self.base_dir / "backups" / f"{kind}_{timestamp}.jsonl"
+        
+    def _io_loop(self):
+        """Apply queued history writes on the background writer thread"""
+        history = None
         
-        # Create backup if history exists
-        if history_file.exists():
-            self._create_backup()
+        while True:
+            try:
+                # Flush buffered appends once the queue has been idle for 100ms
+                op, arg = self._io_queue.get(timeout=0.1 if history else None)
+            except queue.Empty:
+                try:
+                    history.close()
+                    self._save_history_meta()
+                except Exception as e:
+                    # The summary may no longer match the file; stop maintaining it
+                    self._history_meta = None
+                    self.logger.error(f"Error saving history: {e}")
+                history = None
+                continue
+                
+            try:
+                if op == "append":
+                    if history is None:
+                        history = open(self.history_file, 'ab', buffering=64 * 1024)
+                    history.write(json_dumps_line(arg))
+                    if self._history_meta is not None:
+                        add_to_history_meta(self._history_meta, arg)
+                    continue
+                    
+                if op == "prune_cache":
+                    # Independent of the history file, so pending appends stay buffered
+                    self._prune_response_cache()
+                    continue
+                    
+                # Every other operation needs the appends on disk first
+                if history is not None:
+                    history.close()
+                    history = None
+                    self._save_history_meta()
+                    
+                if op == "compact":
+                    # The rewrite replaces the file, so the backup can share its inode
+                    self._create_backup(link=True)
+                    if self._write_history(arg):
+                        self._history_meta = history_meta(arg)
+                        self._save_history_meta()
+                elif op == "meta":
+                    self._save_history_meta()
+                elif op == "archive":
+                    self._archive_messages(arg)
+                elif op == "backup":
+                    self._create_backup()
+                elif op == "stop":
+                    return
+            except Exception as e:
+                self._history_meta = None
+                self.logger.error(f"Error saving history: {e}")
+            finally:
+                if op == "flush":
+                    arg.set()
+                    
+    def _archive_messages(self, messages: List[Dict[str, Any]]):
+        """Append messages to archives/YYYY-MM.jsonl by the month of their timestamp (writer thread only)"""
+        archive_dir = self.base_dir / "archives"
+        archive_dir.mkdir(exist_ok=True)
+        
+        by_month: Dict[str, List[bytes]] = {}
+        for message in messages:
+            month = str(message.get("timestamp") or "")[:7] or "undated"
+            by_month.setdefault(month, []).append(json_dumps_line(message))
+        for month, lines in by_month.items():
+            with open(archive_dir / f"{month}.jsonl", 'ab') as f:
+                f.writelines(lines)
+                
+    def iter_archived_messages(self) -> Generator[Dict[str, Any], None, None]:
+        """Yield archived messages month by month, oldest first, reading one line at a time"""
+        archive_dir = self.base_dir / "archives"
+        if not archive_dir.is_dir():
+            return
+        for archive in sorted(archive_dir.glob("*.jsonl")):
+            yield from iter_history_file(archive)
+            
+    def _save_history_meta(self):
+        """Write history.meta.json for the current history file (writer thread only)"""
+        if self._history_meta is not None and self.history_file.exists():
+            save_history_meta(self.history_file, self._history_meta)
+            
+    def flush_history(self):
+        """Block until all queued history writes have reached disk"""
+        if not self._io_thread.is_alive():
+            # Closed: everything was written before the writer stopped
+            return
+        done = threading.Event()
+        self._io_queue.put(("flush", done))
+        done.wait()
+        
+    def close(self):
+        """Write pending history, stop the writer thread and release the agent's resources"""
+        if self._io_thread.is_alive():
+            self._io_queue.put(("stop", None))
+            self._io_thread.join()
+        atexit.unregister(self.close)
+        if self._history_index is not None:
+            self._history_index.close()
+            self._history_index = None
+            
+    def __enter__(self) -> "UnifiedOpenAIAgent":
+        return self
+        
+    def __exit__(self, *exc_info):
+        self.close()
+        
+    def _append_message(self, message: Dict[str, Any]):
+        """Queue a single message to be appended to history.jsonl"""
+        self._io_queue.put(("append", message))
+        
+    def _write_history(self, messages: List[Dict[str, Any]]) -> bool:
+        """Atomically rewrite history.jsonl with the given messages"""
+        tmp_file = self.history_file.with_suffix(".jsonl.tmp")
         
         try:
-            with open(history_file, 'w', encoding='utf-8') as f:
-                json.dump(self.messages, f, indent=2, ensure_ascii=False)
+            with open(tmp_file, 'wb', buffering=8192) as f:
+                for message in messages:
+                    f.write(json_dumps_line(message))
+            os.replace(tmp_file, self.history_file)
+            return True
         except Exception as e:
             self.logger.error(f"Error saving history: {e}")
+            return False
+            
+    def _save_history(self):
+        """Compact history.jsonl to the current messages with backup"""
+        self._io_queue.put(("compact", list(self.messages)))
+        self._appended_since_backup = 0
             
-    def _create_backup(self):
-        """Create rolling backup of history"""
-        history_file = self.base_dir / "history.json"
+    def _create_backup(self, link: bool = False):
+        """Create rolling backup of history
+        
+        With link=True the backup is a hard link, which is only safe when the
+        history file is about to be replaced rather than appended to.
+        """
         backup_dir = self.base_dir / "backups"
         
-        if not history_file.exists():
+        if not self.history_file.exists():
             return
             
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_file = backup_dir / f"history_{timestamp}.json"
+        backup_file = backup_dir / f"history_{timestamp}.jsonl"
         
         try:
-            import shutil
-            shutil.copy2(history_file, backup_file)
+            if link:
+                try:
+                    os.link(self.history_file, backup_file)
+                except OSError:
+                    shutil.copy2(self.history_file, backup_file)
+            else:
+                shutil.copy2(self.history_file, backup_file)
             
             # Keep only last 10 backups
-            backups = sorted(backup_dir.glob("history_*.json"))
+            backups = sorted(backup_dir.glob("history_*"))
             while len(backups) > 10:
                 oldest = backups.pop(0)
                 oldest.unlink()
@@ -201,69 +443,138 @@ class UnifiedOpenAIAgent:
             
     def add_message(self, role: str, content: str, metadata: Optional[Dict[str, Any]] = None):
         """Add a message to conversation history"""
+        now = datetime.now()
         message = {
             "role": role,
             "content": content,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "metadata": metadata or {}
         }
         
         self.messages.append(message)
+        if role in ["user", "assistant"]:
+            self._api_messages.append(self._to_api_message(message))
+            self._stats[role] += 1
+        self._stats["chars"] += len(content)
+        self._stats["last_ts"] = now
+        if self._stats["first_ts"] is None:
+            self._stats["first_ts"] = now
+        if self._content_lower is not None:
+            self._content_lower.append(content.lower())
+        
+        # Truncate history in batches once it grows past the slack
+        if len(self.messages) > self.config.max_history_size + self.TRUNCATE_SLACK:
+            removed = len(self.messages) - self.config.max_history_size
+            # Truncated messages move to the monthly archives rather than being dropped
+            self._io_queue.put(("archive", self.messages[:removed]))
+            del self.messages[:removed]
+            if self._content_lower is not None:
+                del self._content_lower[:removed]
+            self._api_messages = self._build_api_messages()
+            self._stats = self._build_stats()
+            self.logger.info(f"Truncated history: removed {removed} old messages")
+            self._save_history()
+            return
         
-        # Truncate history if needed
-        if len(self.messages) > self.config.max_history_size:
-            removed = self.messages[:-self.config.max_history_size]
-            self.messages = self.messages[-self.config.max_history_size:]
-            self.logger.info(f"Truncated history: removed {len(removed)} old messages")
+        self._append_message(message)
         
-        self._save_history()
+        # Periodic backup instead of one per message
+        self._appended_since_backup += 1
+        if self._appended_since_backup >= self.BACKUP_INTERVAL:
+            self._io_queue.put(("backup", None))
+            self._appended_since_backup = 0
+        
+    def _build_stats(self) -> Dict[str, Any]:
+        """Compute the running statistics counters from the full history"""
+        stats = {"user": 0, "assistant": 0, "chars": 0, "first_ts": None, "last_ts": None}
+        
+        for msg in self.messages:
+            if msg["role"] in stats:
+                stats[msg["role"]] += 1
+            stats["chars"] += len(msg["content"])
+            
+        if self.messages:
+            stats["first_ts"] = datetime.fromisoformat(self.messages[0]["timestamp"])
+            stats["last_ts"] = datetime.fromisoformat(self.messages[-1]["timestamp"])
+            
+        return stats
+        
+    def _build_api_messages(self) -> List[Dict[str, Any]]:
+        """Convert the full history to the API message structure"""
+        return [
+            self._to_api_message(msg) for msg in self.messages
+            if msg["role"] in ["user", "assistant"]
+        ]
+        
+    @staticmethod
+    def _to_api_message(msg: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a stored message to the API message structure"""
+        return {
+            "role": msg["role"],
+            "content": [
+                {"type": "text", "text": msg["content"]}
+            ]
+        }
         
     def _build_api_payload(self, new_message: str, override_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Build the API request payload for the current model"""
-        # Process file inclusions
-        processed_message = self.file_handler.process_file_inclusions(
-            new_message, self.base_dir, self.logger
-        )
+        # Process file inclusions (only messages with a {filename} can have any)
+        if "{" in new_message:
+            processed_message = self.file_handler.process_file_inclusions(
+                new_message, self.base_dir, self.logger
+            )
+        else:
+            processed_message = new_message
         
         # Build messages in the API structure
         messages = []
         
         # Add system prompt as developer role if configured
-        if self.config.system_prompt:
-            messages.append({
-                "role": "developer",
-                "content": [
-                    {"type": "text", "text": self.config.system_prompt}
-                ]
-            })
+        if self._system_envelope:
+            messages.append(self._system_envelope)
         
-        # Add conversation history (convert from storage format to API format)
-        for msg in self.messages:
-            if msg["role"] in ["user", "assistant"]:
-                messages.append({
-                    "role": msg["role"],
-                    "content": [
-                        {"type": "text", "text": msg["content"]}
-                    ]
-                })
+        # Add conversation history (already in API format)
+        messages.extend(self._api_messages)
         
-        # Add new user message
-        messages.append({
-            "role": "user",
-            "content": [
-                {"type": "text", "text": processed_message}
-            ]
-        })
+        # Add new user message, reusing the history envelope when the text is unchanged
+        last = self._api_messages[-1] if self._api_messages else None
+        if last and last["role"] == "user" and last["content"][0]["text"] == processed_message:
+            messages.append(last)
+        else:
+            messages.append(self._to_api_message({"role": "user", "content": processed_message}))
         
-        # Apply config overrides
-        config = asdict(self.config)
+        # Apply config overrides, or reuse the fields precomputed for the config
         if override_config:
+            config = asdict(self.config)
             config.update(override_config)
+            payload = self._payload_fields(config)
+        else:
+            payload = dict(self._payload_template)
+            
+        payload["messages"] = messages
+        return payload
         
-        # Build payload matching the API structure
+    def _specialize_payload(self):
+        """Precompute the payload fields and developer message for the current config"""
+        self._payload_template = self._payload_fields(asdict(self.config))
+        
+        if self.config.system_prompt:
+            self._system_envelope = {
+                "role": "developer",
+                "content": [
+                    {"type": "text", "text": self.config.system_prompt}
+                ]
+            }
+        else:
+            self._system_envelope = None
+            
+    @staticmethod
+    def _payload_fields(config: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the payload fields that depend only on the config"""
+        # Build payload matching the API structure (messages are set per request)
         payload = {
             "model": config["model"],
-            "messages": messages,
+            "messages": None,
             "response_format": {"type": config["text_format"]},
             "reasoning_effort": config["reasoning_effort"]
         }
@@ -284,15 +595,35 @@ class UnifiedOpenAIAgent:
             
         return payload
         
+    def prewarm(self):
+        """Import the HTTP stack on a background thread so the first API call does not wait for it"""
+        threading.Thread(target=self._import_http, name=f"prewarm-{self.agent_id}", daemon=True).start()
+        
+    @staticmethod
+    def _import_http():
+        """Import requests (the import lock makes a concurrent import by the caller wait, not repeat)"""
+        import requests.adapters  # noqa: F401
+        
+    @cached_property
+    def _session(self) -> "requests.Session":
+        """Keep-alive HTTP session reused across API requests"""
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        session = requests.Session()
+        session.headers.update({"Content-Type": "application/json"})
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+        return session
+        
     def _get_timeout_for_reasoning(self, reasoning_effort: str = "medium") -> int:
         """Get appropriate timeout based on model and reasoning effort"""
-        model_config = ModelConfig.get_model_config(self.model)
-        return model_config["reasoning_timeout"].get(reasoning_effort, 300)
+        return self._reasoning_timeouts.get(reasoning_effort, 300)
         
-    def _make_api_request(self, payload: Dict[str, Any]) -> requests.Response:
+    def _make_api_request(self, payload: Dict[str, Any]) -> "requests.Response":
         """Make API request with retries and error handling"""
+        from requests.exceptions import RequestException, Timeout
+        
         headers = {
-            "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}"
         }
         
@@ -300,8 +631,7 @@ class UnifiedOpenAIAgent:
         reasoning_effort = payload.get("reasoning_effort", "medium")
         timeout = self._get_timeout_for_reasoning(reasoning_effort)
         
-        model_config = ModelConfig.get_model_config(self.model)
-        model_display = model_config["name"]
+        model_display = self._model_display
         
         self.logger.info(f"Using timeout of {timeout}s for {model_display} with reasoning effort: {reasoning_effort}")
         
@@ -312,7 +642,7 @@ class UnifiedOpenAIAgent:
             try:
                 self.logger.info(f"Making API request to {model_display} (attempt {attempt + 1}/{max_retries}) with {timeout}s timeout...")
                 
-                response = requests.post(
+                response = self._session.post(
                     self.api_url,
                     headers=headers,
                     json=payload,
@@ -358,41 +688,118 @@ class UnifiedOpenAIAgent:
         
         raise Exception(f"Failed to complete API request after {max_retries} attempts")
         
-    def _parse_streaming_response(self, response: requests.Response) -> Generator[str, None, None]:
-        """Parse streaming Server-Sent Events response"""
-        assistant_message = ""
+    def _cache_key(self, payload: Dict[str, Any]) -> str:
+        """Compute the response cache key for a request payload"""
+        request = {key: value for key, value in payload.items() if key != "stream"}
+        return hashlib.blake2b(json_dumps_line(request), digest_size=16).hexdigest()
+        
+    def _get_cached_response(self, cache_key: str) -> Optional[str]:
+        """Get a cached response for a cache key, if any"""
+        cache_file = self.base_dir / "cache" / f"{cache_key}.json"
         
         try:
-            for line in response.iter_lines(decode_unicode=True):
-                if not line or line.strip() == "":
-                    continue
+            if time.time() - cache_file.stat().st_mtime > self.RESPONSE_CACHE_MAX_AGE:
+                # Expired; the next prune removes it
+                return None
+            return json_loads(cache_file.read_bytes())["content"]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.warning(f"Error reading cached response: {e}")
+        return None
+        
+    def _store_cached_response(self, cache_key: str, content: str):
+        """Store a completed response in the response cache"""
+        cache_file = self.base_dir / "cache" / f"{cache_key}.json"
+        
+        try:
+            cache_file.write_bytes(json_dumps_line({
+                "content": content,
+                "created_at": datetime.now().isoformat()
+            }))
+        except Exception as e:
+            self.logger.warning(f"Error caching response: {e}")
+            return
+            
+        # Evict off the response path, on the writer thread
+        self._io_queue.put(("prune_cache", None))
+        
+    def _prune_response_cache(self):
+        """Drop expired cache entries and the oldest beyond RESPONSE_CACHE_MAX_ENTRIES (writer thread only)"""
+        cutoff = time.time() - self.RESPONSE_CACHE_MAX_AGE
+        try:
+            entries = []
+            with os.scandir(self.base_dir / "cache") as it:
+                for entry in it:
+                    if entry.name.endswith(".json") and entry.is_file():
+                        entries.append((entry.stat().st_mtime, entry.path))
+                        
+            entries.sort(reverse=True)
+            for index, (mtime, path) in enumerate(entries):
+                if index >= self.RESPONSE_CACHE_MAX_ENTRIES or mtime < cutoff:
+                    os.remove(path)
+        except OSError as e:
+            # Only costs disk space until the next prune
+            self.logger.warning(f"Error pruning response cache: {e}")
+            
+    @staticmethod
+    def _iter_sse_data(response: "requests.Response") -> Generator[bytes, None, None]:
+        """Yield the raw payload of each Server-Sent Events data line"""
+        buffer = bytearray()
+        
+        for chunk in response.iter_content(chunk_size=4096):
+            buffer += chunk
+            start = 0
+            
+            while True:
+                end = buffer.find(b"\n", start)
+                if end == -1:
+                    break
+                    
+                line = bytes(buffer[start:end]).strip()
+                start = end + 1
                 
+                if line.startswith(b"data:"):
+                    yield line[5:].lstrip()
+                    
+            del buffer[:start]
+            
+        # Trailing line without a final newline
+        line = bytes(buffer).strip()
+        if line.startswith(b"data:"):
+            yield line[5:].lstrip()
+            
+    def _parse_streaming_response(self, response: "requests.Response", cache_key: Optional[str] = None) -> Generator[str, None, None]:
+        """Parse streaming Server-Sent Events response"""
+        parts: List[str] = []
+        completed = False
+        
+        try:
+            for data_bytes in self._iter_sse_data(response):
+                if data_bytes == b"[DONE]":
+                    completed = True
+                    break
+                    
                 try:
-                    # Handle Server-Sent Events format
-                    if line.startswith("data: "):
-                        data_str = line[5:].strip()
+                    data = json_loads(data_bytes)
+                    
+                    # Handle streaming format
+                    choices = data.get("choices", [])
+                    if choices:
+                        choice = choices[0]
+                        delta = choice.get("delta", {})
+                        content = delta.get("content", "")
                         
-                        if data_str == "[DONE]":
-                            break
+                        if content:
+                            parts.append(content)
+                            yield content
                             
-                        data = json.loads(data_str)
-                        
-                        # Handle streaming format
-                        choices = data.get("choices", [])
-                        if choices:
-                            choice = choices[0]
-                            delta = choice.get("delta", {})
-                            content = delta.get("content", "")
+                        # Check for completion
+                        finish_reason = choice.get("finish_reason")
+                        if finish_reason == "stop":
+                            completed = True
+                            break
                             
-                            if content:
-                                assistant_message += content
-                                yield content
-                                
-                            # Check for completion
-                            finish_reason = choice.get("finish_reason")
-                            if finish_reason == "stop":
-                                break
-                                
                 except json.JSONDecodeError as e:
                     self.logger.warning(f"Invalid JSON in stream: {e}")
                     continue
@@ -402,12 +809,19 @@ class UnifiedOpenAIAgent:
                     
         except Exception as e:
             self.logger.error(f"Error parsing streaming response: {e}")
+        finally:
+            # Also runs when the consumer closes the generator mid-stream
+            response.close()
             
+        assistant_message = "".join(parts)
+        
         # Add assistant message to history if we got content
         if assistant_message.strip():
             self.add_message("assistant", assistant_message)
+            if cache_key and completed:
+                self._store_cached_response(cache_key, assistant_message)
             
-    def _parse_non_streaming_response(self, response: requests.Response) -> str:
+    def _parse_non_streaming_response(self, response: "requests.Response", cache_key: Optional[str] = None) -> str:
         """Parse non-streaming response from OpenAI chat completions API"""
         try:
             data = response.json()
@@ -425,6 +839,8 @@ class UnifiedOpenAIAgent:
                     
                 if content:
                     self.add_message("assistant", content)
+                    if cache_key:
+                        self._store_cached_response(cache_key, content)
                     return content
                                 
             return "No response content received"
@@ -442,13 +858,24 @@ class UnifiedOpenAIAgent:
             # Build API payload
             payload = self._build_api_payload(new_message, override_config)
             
+            # Serve identical requests from the response cache
+            cache_key = None
+            if not (override_config or {}).get("no_cache"):
+                cache_key = self._cache_key(payload)
+                cached = self._get_cached_response(cache_key)
+                if cached is not None:
+                    self.logger.info(f"Using cached response ({cache_key})")
+                    self.add_message("assistant", cached, {"cached": True})
+                    yield cached
+                    return
+            
             self.logger.info(f"Making API call to {self.api_url}")
-            self.logger.debug(f"Payload: {json.dumps(payload, indent=2)}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Payload: %s", json.dumps(payload, indent=2))
             
             # Show model and reasoning info to user
             reasoning_effort = payload.get("reasoning_effort", "medium")
-            model_config = ModelConfig.get_model_config(self.model)
-            model_display = model_config["name"]
+            model_display = self._model_display
             
             if reasoning_effort in ["medium", "high"]:
                 timeout = self._get_timeout_for_reasoning(reasoning_effort)
@@ -459,9 +886,9 @@ class UnifiedOpenAIAgent:
             
             # Handle streaming vs non-streaming
             if payload.get("stream", True):
-                yield from self._parse_streaming_response(response)
+                yield from self._parse_streaming_response(response, cache_key)
             else:
-                result = self._parse_non_streaming_response(response)
+                result = self._parse_non_streaming_response(response, cache_key)
                 yield result
                 
         except Exception as e:
@@ -469,11 +896,58 @@ class UnifiedOpenAIAgent:
             self.logger.error(error_msg)
             yield error_msg
             
+    async def acall_api(self, new_message: str, override_config: Optional[Dict[str, Any]] = None) -> AsyncGenerator[str, None]:
+        """Call OpenAI API without blocking the event loop"""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        # Set when the consumer stops early (closed, cancelled, or the loop shut down)
+        abandoned = threading.Event()
+        
+        def put(item):
+            if abandoned.is_set() or loop.is_closed():
+                return
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                # The loop closed between the check and the call
+                pass
+                
+        def produce():
+            chunks = self.call_api(new_message, override_config)
+            try:
+                for chunk in chunks:
+                    if abandoned.is_set():
+                        break
+                    put(chunk)
+            finally:
+                # Stops the stream and skips recording a partial reply
+                chunks.close()
+                put(done)
+                
+        # The blocking request and stream parsing run in a worker thread
+        producer = loop.run_in_executor(None, produce)
+        
+        try:
+            while True:
+                chunk = await queue.get()
+                if chunk is done:
+                    break
+                yield chunk
+                
+            await producer
+        finally:
+            abandoned.set()
+        
     def clear_history(self):
         """Clear conversation history"""
-        self._create_backup()
         self.messages.clear()
+        self._api_messages.clear()
+        self._stats = self._build_stats()
+        self._content_lower = None
         self._save_history()
+        self.flush_history()
         self.logger.info("Conversation history cleared")
         
     def get_statistics(self) -> Dict[str, Any]:
@@ -490,20 +964,18 @@ class UnifiedOpenAIAgent:
                 "conversation_duration": None
             }
             
-        user_msgs = [m for m in self.messages if m["role"] == "user"]
-        assistant_msgs = [m for m in self.messages if m["role"] == "assistant"]
+        stats = self._stats
+        total_chars = stats["chars"]
+        avg_length = total_chars // len(self.messages)
         
-        total_chars = sum(len(m["content"]) for m in self.messages)
-        avg_length = total_chars // len(self.messages) if self.messages else 0
-        
-        first_time = datetime.fromisoformat(self.messages[0]["timestamp"])
-        last_time = datetime.fromisoformat(self.messages[-1]["timestamp"])
+        first_time = stats["first_ts"]
+        last_time = stats["last_ts"]
         duration = last_time - first_time
         
         return {
             "total_messages": len(self.messages),
-            "user_messages": len(user_msgs),
-            "assistant_messages": len(assistant_msgs),
+            "user_messages": stats["user"],
+            "assistant_messages": stats["assistant"],
             "total_characters": total_chars,
             "average_message_length": avg_length,
             "first_message": first_time.strftime("%Y-%m-%d %H:%M:%S"),
@@ -511,43 +983,113 @@ class UnifiedOpenAIAgent:
             "conversation_duration": str(duration).split('.')[0] if duration.total_seconds() > 0 else "0:00:00"
         }
         
-    def export_conversation(self, format_type: str) -> str:
-        """Export conversation to specified format"""
-        model_config = ModelConfig.get_model_config(self.model)
+    def snapshot_history(self) -> List[Dict[str, Any]]:
+        """Point-in-time copy of the message list for exporters (the message dicts are shared)"""
+        return list(self.messages)
+        
+    def export_conversation(self, format_type: str, metadata: bool = True,
+                            snapshot: Optional[List[Dict[str, Any]]] = None) -> str:
+        """Export conversation to specified format, optionally from an existing snapshot"""
         return self.exporter.export_conversation(
             format_type, 
             self.agent_id,
             self.model,
-            model_config["name"],
+            self._model_display,
+            self.config,
+            self.messages if snapshot is None else snapshot,
+            self.get_statistics(),
+            self.base_dir / "exports",
+            metadata
+        )
+        
+    def export_all(self, formats: Optional[List[str]] = None,
+                   snapshot: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Union[str, Exception]]:
+        """Export conversation to several formats at once"""
+        if formats is None:
+            formats = self.exporter.supported_formats
+        # The worker threads share one snapshot, so a message added meanwhile
+        # (e.g. by acall_api's producer thread) cannot make the formats disagree
+        return self.exporter.export_all(
+            formats,
+            self.agent_id,
+            self.model,
+            self._model_display,
             self.config,
-            self.messages,
+            self.snapshot_history() if snapshot is None else snapshot,
             self.get_statistics(),
             self.base_dir / "exports"
         )
         
-    def search_history(self, term: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Search conversation history for a term"""
+    def search_history(self, term: str, limit: int = 10, archived: bool = False) -> List[Dict[str, Any]]:
+        """Search conversation history for a term, then the monthly archives if archived is set"""
         results = []
         term_lower = term.lower()
         
-        for i, msg in enumerate(self.messages):
-            if term_lower in msg["content"].lower():
+        # Substring tests on contents lowercased once beat a re.IGNORECASE pattern, and
+        # match a str.find over the joined contents, which still has to scan everything
+        if self._content_lower is None:
+            self._content_lower = [msg["content"].lower() for msg in self.messages]
+            
+        for i, content_lower in enumerate(self._content_lower):
+            if term_lower in content_lower:
+                msg = self.messages[i]
                 results.append({
                     "index": i,
                     "message": msg,
                     "preview": msg["content"][:100] + "..." if len(msg["content"]) > 100 else msg["content"]
                 })
                 
-            if len(results) >= limit:
-                break
+                if len(results) >= limit:
+                    break
                 
+        if archived and len(results) < limit:
+            # Archives are only read on request; wait for pending archive writes first
+            self.flush_history()
+            for msg in self.iter_archived_messages():
+                content = msg.get("content", "")
+                if term_lower in content.lower():
+                    results.append({
+                        "index": None,
+                        "message": msg,
+                        "preview": content[:100] + "..." if len(content) > 100 else content
+                    })
+                    if len(results) >= limit:
+                        break
+                        
         return results
         
+    def search_history_fts(self, term: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Search conversation history through the full-text index, best matches first"""
+        try:
+            if self._history_index is None:
+                self._history_index = HistoryIndex(self.base_dir / HISTORY_FTS_FILE)
+            # Index whatever was added since the last search (or rebuild after truncation)
+            self._history_index.sync(self.messages)
+            rows = self._history_index.search(term, limit)
+        except Exception as e:
+            # SQLite without FTS5, or an unusable index file
+            self.logger.warning(f"Full-text search unavailable, scanning history: {e}")
+            return self.search_history(term, limit)
+            
+        return [{"index": i, "message": self.messages[i], "preview": snippet} for i, snippet in rows]
+        
     def list_files(self) -> List[str]:
         """List available files for inclusion"""
         return self.file_handler.list_files(self.base_dir)
         
     def get_model_display_name(self) -> str:
         """Get the display name for the current model"""
-        model_config = ModelConfig.get_model_config(self.model)
-        return model_config["name"]
\ No newline at end of file
+        return self._model_display
+
+
+async def run_parallel(jobs: List[Tuple[UnifiedOpenAIAgent, str]]) -> List[str]:
+    """Run one prompt on each of several agents concurrently and return the responses"""
+    import asyncio
+    agents = [agent for agent, _ in jobs]
+    if len(set(map(id, agents))) != len(agents):
+        raise ValueError("Each agent can only appear once in a parallel run")
+        
+    async def collect(agent: UnifiedOpenAIAgent, prompt: str) -> str:
+        return "".join([chunk async for chunk in agent.acall_api(prompt)])
+        
+    return await asyncio.gather(*(collect(agent, prompt) for agent, prompt in jobs))
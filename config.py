@@ -6,12 +6,66 @@ This module handles all configuration aspects for the unified OpenAI agent syste
 including model configurations, agent settings, and validation.
 """
 
-from dataclasses import dataclass, asdict
-from typing import Dict, Any, Optional, List
+import copy
+import json
+import math
+import os
+import sys
+import time
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 
+# Optional dependency, imported on first batch estimate - falls back to a Python loop
+_np = None
 
-@dataclass
+
+def _get_numpy():
+    """Import NumPy once, on first use; None when it is not installed"""
+    global _np
+    if _np is None:
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:
+            _np = False
+    return _np or None
+
+
+# Accepted values for validated settings
+_VALID_EFFORTS = frozenset({"low", "medium", "high"})
+_VALID_SUMMARIES = frozenset({"auto", "detailed", "none"})
+_YES_ANSWERS = frozenset({"y", "yes", "true"})
+_NO_ANSWERS = frozenset({"n", "no", "false"})
+
+# Last formatted timestamp as [epoch second, ISO string]
+_last_timestamp: List[Any] = [None, ""]
+
+
+def now_iso() -> str:
+    """Current local time as an ISO string at second resolution, formatted once per second"""
+    second = int(time.time())
+    if second != _last_timestamp[0]:
+        _last_timestamp[0] = second
+        _last_timestamp[1] = datetime.fromtimestamp(second).isoformat()
+    return _last_timestamp[1]
+
+
+def _freeze(mapping: Dict[str, Any]) -> MappingProxyType:
+    """Wrap a nested dict in read-only mapping proxies"""
+    return MappingProxyType({
+        key: _freeze(value) if isinstance(value, dict) else value
+        for key, value in mapping.items()
+    })
+
+
+# Pricing used for models without a pricing entry
+_DEFAULT_PRICING = MappingProxyType({"input": 0.0, "output": 0.0})
+
+
+@dataclass(slots=True)
 class AgentConfig:
     """Configuration settings for the Unified OpenAI Agent"""
     model: str = "o1"
@@ -32,32 +86,20 @@ class AgentConfig:
     updated_at: str = ""
 
     def __post_init__(self):
+        now = now_iso()
         if not self.created_at:
-            self.created_at = datetime.now().isoformat()
-        self.updated_at = datetime.now().isoformat()
-        
-        # Validate model
-        if self.model not in ModelConfig.SUPPORTED_MODELS:
-            raise ValueError(f"Unsupported model: {self.model}")
+            self.created_at = now
+        self.updated_at = now
         
-        # Validate reasoning effort
-        if self.reasoning_effort not in ["low", "medium", "high"]:
-            self.reasoning_effort = "medium"
-        
-        # Validate temperature
-        if not (0.0 <= self.temperature <= 2.0):
-            self.temperature = 1.0
-            
-        # Validate top_p
-        if not (0.0 <= self.top_p <= 1.0):
-            self.top_p = 1.0
+        # Validate settings (built by _make_config_validator once ModelConfig exists)
+        self._validate()
 
 
 class ModelConfig:
     """Model configuration and information management"""
     
-    # Comprehensive model configurations
-    SUPPORTED_MODELS = {
+    # Comprehensive model configurations (read-only, safe to share without copying)
+    SUPPORTED_MODELS = _freeze({
         "o1": {
             "name": "O1",
             "description": "Advanced reasoning model with sophisticated problem-solving capabilities",
@@ -94,30 +136,41 @@ class ModelConfig:
             "max_output_tokens": 65536,
             "pricing": {"input": 0.002, "output": 0.008}
         }
-    }
+    })
     
-    @classmethod
-    def get_model_config(cls, model: str) -> Dict[str, Any]:
-        """Get configuration for a specific model"""
-        if model not in cls.SUPPORTED_MODELS:
+    # Derived model lists, computed once since the model table is constant
+    _AVAILABLE_MODELS = tuple(SUPPORTED_MODELS)
+    _MODEL_NAMES = MappingProxyType({model: config["name"] for model, config in SUPPORTED_MODELS.items()})
+    _REASONING_MODELS = tuple(model for model, config in SUPPORTED_MODELS.items()
+                              if config.get("has_reasoning", False))
+    
+    # Price lookup tables for batch cost estimates
+    _MODEL_INDEX = {model: i for i, model in enumerate(SUPPORTED_MODELS)}
+    # (input, output) per-model price arrays, built on the first NumPy batch estimate
+    _PRICE_ARRAYS = None
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_model_config(model: str) -> MappingProxyType:
+        """Get configuration for a specific model (read-only)"""
+        if model not in ModelConfig.SUPPORTED_MODELS:
             raise ValueError(f"Unsupported model: {model}")
-        return cls.SUPPORTED_MODELS[model]
+        return ModelConfig.SUPPORTED_MODELS[model]
     
     @classmethod
     def get_available_models(cls) -> List[str]:
         """Get list of available models"""
-        return list(cls.SUPPORTED_MODELS.keys())
+        return list(cls._AVAILABLE_MODELS)
     
     @classmethod
     def get_model_names(cls) -> Dict[str, str]:
         """Get mapping of model IDs to display names"""
-        return {model: config["name"] for model, config in cls.SUPPORTED_MODELS.items()}
+        return dict(cls._MODEL_NAMES)
     
     @classmethod
     def get_reasoning_models(cls) -> List[str]:
         """Get list of models that support reasoning"""
-        return [model for model, config in cls.SUPPORTED_MODELS.items() 
-                if config.get("has_reasoning", False)]
+        return list(cls._REASONING_MODELS)
     
     @classmethod
     def get_timeout_for_model(cls, model: str, reasoning_effort: str = "medium") -> int:
@@ -129,17 +182,51 @@ class ModelConfig:
     def estimate_cost(cls, model: str, input_tokens: int, output_tokens: int) -> float:
         """Estimate cost for a request"""
         config = cls.get_model_config(model)
-        pricing = config.get("pricing", {"input": 0, "output": 0})
+        pricing = config.get("pricing", _DEFAULT_PRICING)
         
-        input_cost = (input_tokens / 1000) * pricing["input"]
-        output_cost = (output_tokens / 1000) * pricing["output"]
+        # Prices are per 1K tokens
+        return (input_tokens * pricing["input"] + output_tokens * pricing["output"]) * 0.001
+    
+    @classmethod
+    def estimate_cost_batch(cls, models, input_tokens, output_tokens):
+        """Estimate costs for many requests at once
         
-        return input_cost + output_cost
+        Returns a NumPy array when NumPy is installed, otherwise a list.
+        """
+        np = _get_numpy()
+        if np is None:
+            return [cls.estimate_cost(model, inp, out)
+                    for model, inp, out in zip(models, input_tokens, output_tokens)]
+            
+        if cls._PRICE_ARRAYS is None:
+            cls._PRICE_ARRAYS = (
+                np.array([config["pricing"]["input"] for config in cls.SUPPORTED_MODELS.values()]),
+                np.array([config["pricing"]["output"] for config in cls.SUPPORTED_MODELS.values()])
+            )
+        input_prices, output_prices = cls._PRICE_ARRAYS
+            
+        try:
+            idx = np.fromiter((cls._MODEL_INDEX[model] for model in models), dtype=np.intp)
+        except KeyError as e:
+            raise ValueError(f"Unsupported model: {e.args[0]}") from None
+            
+        inputs = np.asarray(input_tokens, dtype=float)
+        outputs = np.asarray(output_tokens, dtype=float)
+        return (inputs * input_prices[idx] + outputs * output_prices[idx]) * 0.001
     
     @classmethod
     def validate_model_params(cls, model: str, **params) -> Dict[str, Any]:
         """Validate and adjust parameters for a specific model"""
         config = cls.get_model_config(model)
+        
+        # Fast path: parameters that are already valid are returned unchanged
+        temperature = params.get("temperature")
+        max_tokens = params.get("max_output_tokens")
+        if (temperature is not None and 0.0 <= temperature <= 2.0
+                and params.get("reasoning_effort") in _VALID_EFFORTS
+                and (max_tokens is None or max_tokens <= config.get("max_output_tokens", 4096))):
+            return params
+            
         validated = {}
         
         # Validate max_output_tokens
@@ -150,22 +237,50 @@ class ModelConfig:
         
         # Validate temperature
         temperature = params.get("temperature", 1.0)
-        validated["temperature"] = max(0.0, min(2.0, temperature))
+        validated["temperature"] = max(0.0, min(2.0, temperature)) if math.isfinite(temperature) else 1.0
         
         # Validate reasoning effort
         reasoning_effort = params.get("reasoning_effort", "medium")
-        if reasoning_effort not in ["low", "medium", "high"]:
+        if reasoning_effort not in _VALID_EFFORTS:
             reasoning_effort = "medium"
         validated["reasoning_effort"] = reasoning_effort
         
         return validated
 
 
+def _make_config_validator():
+    """Build the AgentConfig validator with the valid values bound as closure constants"""
+    supported_models = frozenset(ModelConfig.SUPPORTED_MODELS)
+    valid_efforts = _VALID_EFFORTS
+    
+    def _validate(self):
+        """Validate and fix configuration values"""
+        # Validate model
+        if self.model not in supported_models:
+            raise ValueError(f"Unsupported model: {self.model}")
+        
+        # Validate reasoning effort
+        if self.reasoning_effort not in valid_efforts:
+            self.reasoning_effort = "medium"
+        
+        # Clamp temperature and top_p into range (non-finite values fall back to the default)
+        temperature = self.temperature
+        self.temperature = min(2.0, max(0.0, temperature)) if math.isfinite(temperature) else 1.0
+        
+        top_p = self.top_p
+        self.top_p = min(1.0, max(0.0, top_p)) if math.isfinite(top_p) else 1.0
+            
+    return _validate
+
+
+AgentConfig._validate = _make_config_validator()
+
+
 class ConfigManager:
     """Advanced configuration management with validation and presets"""
     
-    # Predefined configuration presets
-    PRESETS = {
+    # Predefined configuration presets (read-only)
+    PRESETS = _freeze({
         "creative": {
             "temperature": 1.5,
             "reasoning_effort": "high",
@@ -190,83 +305,123 @@ class ConfigManager:
             "reasoning_summary": "none",
             "text_verbosity": "low"
         }
+    })
+    
+    # Preset names, computed once since the presets are constant
+    _PRESET_NAMES = tuple(PRESETS)
+    
+    # Validated preset configs keyed by (model, preset), copied for each request
+    _PRESET_CACHE: Dict[Tuple[str, str], AgentConfig] = {}
+    
+    # Preset descriptions
+    _DESCRIPTIONS = {
+        "creative": "High creativity with detailed reasoning for creative tasks",
+        "balanced": "Balanced settings for general use",
+        "focused": "Low temperature with high reasoning for analytical tasks",
+        "fast": "Fast responses with minimal reasoning for quick interactions"
     }
     
     @classmethod
     def create_config_from_preset(cls, model: str, preset: str) -> AgentConfig:
         """Create configuration from a preset"""
-        if preset not in cls.PRESETS:
-            raise ValueError(f"Unknown preset: {preset}")
-        
-        preset_config = cls.PRESETS[preset].copy()
-        preset_config["model"] = model
-        
-        return AgentConfig(**preset_config)
+        template = cls._PRESET_CACHE.get((model, preset))
+        if template is None:
+            if preset not in cls.PRESETS:
+                raise ValueError(f"Unknown preset: {preset}")
+            
+            preset_config = cls.PRESETS[preset].copy()
+            preset_config["model"] = model
+            
+            template = cls._PRESET_CACHE[(model, preset)] = AgentConfig(**preset_config)
+            
+        # Only the timestamps differ between configs from the same preset
+        config = copy.copy(template)
+        config.created_at = config.updated_at = now_iso()
+        return config
     
     @classmethod
     def create_interactive_config(cls, model: str) -> AgentConfig:
         """Create configuration through interactive prompts"""
-        from utils import ColorManager
-        colors = ColorManager()
-        
-        print(f"\n{colors.format_text('CYAN')}Creating Agent Configuration{colors.format_text('RESET')}")
-        print(f"{colors.format_text('YELLOW')}Press Enter to use default values{colors.format_text('RESET')}\n")
+        # Only color the prompts on a terminal, so piped or scripted runs get plain text
+        if sys.stdout.isatty():
+            from utils import ColorManager
+            colors = ColorManager()
+            CYAN, YELLOW, GREEN, WHITE, RED, RESET = (
+                colors.format_text(color) for color in ('CYAN', 'YELLOW', 'GREEN', 'WHITE', 'RED', 'RESET')
+            )
+        else:
+            CYAN = YELLOW = GREEN = WHITE = RED = RESET = ""
         
         config = AgentConfig(model=model)
         model_config = ModelConfig.get_model_config(model)
-        
-        # Show model info
-        print(f"{colors.format_text('GREEN')}Selected Model: {model_config['name']} ({model})")
-        print(f"{colors.format_text('WHITE')}  {model_config['description']}")
         timeouts = model_config["reasoning_timeout"]
-        print(f"  Timeouts: Low={timeouts['low']}s, Medium={timeouts['medium']}s, High={timeouts['high']}s{colors.format_text('RESET')}\n")
+        
+        # Show header and model info in a single write
+        sys.stdout.write(
+            f"\n{CYAN}Creating Agent Configuration{RESET}\n"
+            f"{YELLOW}Press Enter to use default values{RESET}\n\n"
+            f"{GREEN}Selected Model: {model_config['name']} ({model})\n"
+            f"{WHITE}  {model_config['description']}\n"
+            f"  Timeouts: Low={timeouts['low']}s, Medium={timeouts['medium']}s, High={timeouts['high']}s{RESET}\n\n"
+        )
+        sys.stdout.flush()
+        
+        # Prompts only show the defaults, so they can all be built up front
+        prompts = {
+            "temperature": f"Temperature (0.0-2.0) [{config.temperature}]: ",
+            "effort": f"Reasoning effort (low/medium/high) [{config.reasoning_effort}]: ",
+            "summary": f"Reasoning summary (auto/detailed/none) [{config.reasoning_summary}]: ",
+            "system_prompt": "System prompt (optional): ",
+            "max_tokens": f"Max output tokens (optional, max {model_config['max_output_tokens']}): ",
+            "stream": f"Enable streaming (y/n) [{'y' if config.stream else 'n'}]: "
+        }
         
         # Temperature
-        temp_input = input(f"Temperature (0.0-2.0) [{config.temperature}]: ").strip()
+        temp_input = input(prompts["temperature"]).strip()
         if temp_input:
             try:
                 temperature = float(temp_input)
                 if 0.0 <= temperature <= 2.0:
                     config.temperature = temperature
                 else:
-                    print(f"{colors.format_text('RED')}Temperature out of range, using default{colors.format_text('RESET')}")
+                    print(f"{RED}Temperature out of range, using default{RESET}")
             except ValueError:
-                print(f"{colors.format_text('RED')}Invalid temperature, using default{colors.format_text('RESET')}")
+                print(f"{RED}Invalid temperature, using default{RESET}")
         
         # Reasoning effort
-        effort_input = input(f"Reasoning effort (low/medium/high) [{config.reasoning_effort}]: ").strip().lower()
-        if effort_input and effort_input in ["low", "medium", "high"]:
+        effort_input = input(prompts["effort"]).strip().lower()
+        if effort_input in _VALID_EFFORTS:
             config.reasoning_effort = effort_input
             timeout = model_config["reasoning_timeout"].get(config.reasoning_effort, 300)
-            print(f"{colors.format_text('YELLOW')}  → Timeout: {timeout}s ({timeout//60}min {timeout%60}s){colors.format_text('RESET')}")
+            print(f"{YELLOW}  → Timeout: {timeout}s ({timeout//60}min {timeout%60}s){RESET}")
         
         # Reasoning summary
-        summary_input = input(f"Reasoning summary (auto/detailed/none) [{config.reasoning_summary}]: ").strip().lower()
-        if summary_input and summary_input in ["auto", "detailed", "none"]:
+        summary_input = input(prompts["summary"]).strip().lower()
+        if summary_input in _VALID_SUMMARIES:
             config.reasoning_summary = summary_input
         
         # System prompt
-        system_prompt = input(f"System prompt (optional): ").strip()
+        system_prompt = input(prompts["system_prompt"]).strip()
         if system_prompt:
             config.system_prompt = system_prompt
         
         # Max output tokens
-        tokens_input = input(f"Max output tokens (optional, max {model_config['max_output_tokens']}): ").strip()
+        tokens_input = input(prompts["max_tokens"]).strip()
         if tokens_input:
             try:
                 max_tokens = int(tokens_input)
                 if 0 < max_tokens <= model_config["max_output_tokens"]:
                     config.max_output_tokens = max_tokens
                 else:
-                    print(f"{colors.format_text('RED')}Token count out of range, leaving unset{colors.format_text('RESET')}")
+                    print(f"{RED}Token count out of range, leaving unset{RESET}")
             except ValueError:
-                print(f"{colors.format_text('RED')}Invalid token count, leaving unset{colors.format_text('RESET')}")
+                print(f"{RED}Invalid token count, leaving unset{RESET}")
         
         # Streaming
-        stream_input = input(f"Enable streaming (y/n) [{'y' if config.stream else 'n'}]: ").strip().lower()
-        if stream_input in ['n', 'no', 'false']:
+        stream_input = input(prompts["stream"]).strip().lower()
+        if stream_input in _NO_ANSWERS:
             config.stream = False
-        elif stream_input in ['y', 'yes', 'true']:
+        elif stream_input in _YES_ANSWERS:
             config.stream = True
         
         return config
@@ -283,52 +438,175 @@ class ConfigManager:
         )
         
         # Apply validated parameters
-        for key, value in model_params.items():
-            setattr(config, key, value)
+        if "max_output_tokens" in model_params:
+            config.max_output_tokens = model_params["max_output_tokens"]
+        config.temperature = model_params["temperature"]
+        config.reasoning_effort = model_params["reasoning_effort"]
         
         # Update timestamp
-        config.updated_at = datetime.now().isoformat()
+        config.updated_at = now_iso()
         
         return config
     
     @classmethod
     def get_preset_names(cls) -> List[str]:
         """Get list of available presets"""
-        return list(cls.PRESETS.keys())
+        return list(cls._PRESET_NAMES)
     
     @classmethod
     def describe_preset(cls, preset: str) -> str:
         """Get description of a preset"""
-        descriptions = {
-            "creative": "High creativity with detailed reasoning for creative tasks",
-            "balanced": "Balanced settings for general use",
-            "focused": "Low temperature with high reasoning for analytical tasks",
-            "fast": "Fast responses with minimal reasoning for quick interactions"
-        }
-        return descriptions.get(preset, "Custom preset")
+        return cls._DESCRIPTIONS.get(preset, "Custom preset")
+    
+    @classmethod
+    def get_preset_descriptions(cls) -> Tuple[Tuple[str, str], ...]:
+        """Get (name, description) for every preset"""
+        return cls._PRESET_LISTING
+
+
+# (name, description) pairs for preset listings, computed once
+ConfigManager._PRESET_LISTING = tuple(
+    (name, ConfigManager.describe_preset(name)) for name in ConfigManager._PRESET_NAMES
+)
+
+
+# PyYAML module, imported on first use
+_yaml = None
+
+
+def _get_yaml():
+    """Import PyYAML once, on first use"""
+    global _yaml
+    if _yaml is None:
+        import yaml
+        _yaml = yaml
+    return _yaml
+
+
+def _yaml_safe_load(stream) -> Any:
+    """Safely parse YAML, using the C-accelerated loader when available"""
+    yaml = _get_yaml()
+    return yaml.load(stream, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+# Parsed config files keyed by path, with the (mtime, size) they were read at
+_config_file_cache: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+
+
+def _sidecar_path(path: str) -> str:
+    """JSON cache file kept next to a YAML config (config.yaml -> config.cache.json)"""
+    return os.path.splitext(path)[0] + ".cache.json"
+
+
+def _read_sidecar(path: str, stat: os.stat_result) -> Optional[Dict[str, Any]]:
+    """Return the cached config for path if its sidecar matches the YAML's mtime and size"""
+    try:
+        with open(_sidecar_path(path), 'rb') as f:
+            sidecar = json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+        
+    if (isinstance(sidecar, dict) and sidecar.get("mtime_ns") == stat.st_mtime_ns
+            and sidecar.get("size") == stat.st_size and isinstance(sidecar.get("config"), dict)):
+        return sidecar["config"]
+    return None
+
+
+def _write_sidecar(path: str, stat: os.stat_result, config_data: Dict[str, Any]):
+    """Store a parsed config as JSON next to the YAML; failures only cost a re-parse"""
+    sidecar = _sidecar_path(path)
+    temp = f"{sidecar}.{os.getpid()}.tmp"
+    try:
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump({"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "config": config_data}, f)
+        os.replace(temp, sidecar)
+    except (OSError, TypeError, ValueError):
+        # Unwritable directory or values JSON cannot hold (e.g. YAML dates)
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+
+
+def load_config_file(config_path, use_sidecar: bool = False) -> Dict[str, Any]:
+    """Load a YAML configuration file, reusing the parsed result while it is unchanged"""
+    path = os.fspath(config_path)
+    stat = os.stat(path)
+    
+    cached = _config_file_cache.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return dict(cached[2])
+        
+    # The JSON sidecar is only read and written for agent configs (use_sidecar=True)
+    config_data = _read_sidecar(path, stat) if use_sidecar else None
+    if config_data is None:
+        # Hand the parser the whole buffer rather than a file it reads piecemeal
+        with open(path, 'rb') as f:
+            config_data = _yaml_safe_load(f.read())
+        if not isinstance(config_data, dict):
+            # Empty files and non-mapping documents are not configs
+            raise ValueError(f"Config file {path} does not contain a mapping")
+        if use_sidecar:
+            _write_sidecar(path, stat, config_data)
+        
+    _config_file_cache[path] = (stat.st_mtime_ns, stat.st_size, config_data)
+    return dict(config_data)
+
+
+def save_config_file(config_path, config_data: Dict[str, Any], use_sidecar: bool = False):
+    """Save a YAML configuration file, using the C-accelerated dumper when available"""
+    yaml = _get_yaml()
+    path = os.fspath(config_path)
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        yaml.dump(config_data, f, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper),
+                  default_flow_style=False, allow_unicode=True)
+        
+    # The saved data is what the next load would parse
+    stat = os.stat(path)
+    _config_file_cache[path] = (stat.st_mtime_ns, stat.st_size, dict(config_data))
+    if use_sidecar:
+        _write_sidecar(path, stat, config_data)
+
+
+# Validation verdicts keyed by (path, mtime, size), oldest evicted first
+_VALIDATION_CACHE: Dict[Tuple[str, int, int], bool] = {}
+_VALIDATION_CACHE_SIZE = 1024
 
 
 # Configuration validation utilities
 def validate_config_file(config_path: str) -> bool:
-    """Validate a configuration file"""
+    """Validate a configuration file, reusing the verdict while the file is unchanged"""
     try:
-        import yaml
-        with open(config_path, 'r') as f:
-            config_data = yaml.safe_load(f)
+        stat = os.stat(config_path)
+    except OSError:
+        return False
+        
+    key = (os.fspath(config_path), stat.st_mtime_ns, stat.st_size)
+    cached = _VALIDATION_CACHE.get(key)
+    if cached is not None:
+        return cached
+        
+    try:
+        config_data = load_config_file(config_path)
         
         # Try to create AgentConfig to validate
         AgentConfig(**config_data)
-        return True
+        valid = True
     except Exception:
-        return False
+        valid = False
+        
+    if len(_VALIDATION_CACHE) >= _VALIDATION_CACHE_SIZE:
+        del _VALIDATION_CACHE[next(iter(_VALIDATION_CACHE))]
+    _VALIDATION_CACHE[key] = valid
+    return valid
 
 
 def migrate_config(old_config_path: str, new_config_path: str) -> bool:
     """Migrate configuration from old format to new format"""
     try:
-        import yaml
-        with open(old_config_path, 'r') as f:
-            old_config = yaml.safe_load(f)
+        with open(old_config_path, 'rb') as f:
+            old_config = _yaml_safe_load(f.read())
         
         # Create new config with defaults, then update with old values
         new_config = AgentConfig()
@@ -343,9 +621,9 @@ def migrate_config(old_config_path: str, new_config_path: str) -> bool:
             if hasattr(new_config, new_key):
                 setattr(new_config, new_key, value)
         
-        # Save migrated config
-        with open(new_config_path, 'w') as f:
-            yaml.dump(asdict(new_config), f, default_flow_style=False, allow_unicode=True)
+        # Save migrated config (shallow field copy - AgentConfig only holds primitives)
+        config_data = {field.name: getattr(new_config, field.name) for field in fields(new_config)}
+        save_config_file(new_config_path, config_data)
         
         return True
     except Exception:
@@ -6,214 +6,48 @@ This module handles all export functionality for the unified OpenAI agent system
 supporting multiple formats including JSON, TXT, Markdown, HTML, and specialized formats.
 """
 
+import csv
 import json
 import html
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple, Union
 from pathlib import Path
-from dataclasses import asdict
+from dataclasses import dataclass, fields, is_dataclass
+from functools import lru_cache
+from xml.sax.saxutils import XMLGenerator
 
+try:
+    import orjson
+except ImportError:
+    # Optional dependency - fall back to the standard json module
+    orjson = None
 
-class ConversationExporter:
-    """Advanced conversation exporter with multiple format support"""
-    
-    def __init__(self):
-        self.supported_formats = ["json", "txt", "md", "html", "csv", "xml"]
-    
-    def export_conversation(
-        self, 
-        format_type: str,
-        agent_id: str,
-        model: str,
-        model_display: str,
-        config: Any,
-        messages: List[Dict[str, Any]],
-        statistics: Dict[str, Any],
-        export_dir: Path
-    ) -> str:
-        """Export conversation to specified format"""
-        
-        if format_type not in self.supported_formats:
-            raise ValueError(f"Unsupported export format: {format_type}")
-        
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        export_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Route to appropriate export method
-        if format_type == "json":
-            return self._export_json(timestamp, agent_id, model, config, messages, statistics, export_dir)
-        elif format_type == "txt":
-            return self._export_txt(timestamp, agent_id, model, model_display, messages, export_dir)
-        elif format_type == "md":
-            return self._export_markdown(timestamp, agent_id, model, model_display, messages, export_dir)
-        elif format_type == "html":
-            return self._export_html(timestamp, agent_id, model, model_display, config, messages, statistics, export_dir)
-        elif format_type == "csv":
-            return self._export_csv(timestamp, agent_id, model, messages, export_dir)
-        elif format_type == "xml":
-            return self._export_xml(timestamp, agent_id, model, config, messages, statistics, export_dir)
-    
-    def _export_json(
-        self, 
-        timestamp: str,
-        agent_id: str,
-        model: str,
-        config: Any,
-        messages: List[Dict[str, Any]],
-        statistics: Dict[str, Any],
-        export_dir: Path
-    ) -> str:
-        """Export to JSON format with comprehensive metadata"""
-        filename = f"conversation_{timestamp}.json"
-        filepath = export_dir / filename
-        
-        export_data = {
-            "export_info": {
-                "version": "2.0",
-                "exported_at": datetime.now().isoformat(),
-                "exporter": "Unified OpenAI Agent System",
-                "format": "json"
-            },
-            "agent_info": {
-                "agent_id": agent_id,
-                "model": model,
-                "config": asdict(config) if hasattr(config, '__dict__') else config
-            },
-            "conversation": {
-                "messages": messages,
-                "statistics": statistics
-            },
-            "metadata": {
-                "total_tokens_estimate": self._estimate_tokens(messages),
-                "conversation_topics": self._extract_topics(messages),
-                "message_types": self._analyze_message_types(messages)
-            }
-        }
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False, default=str)
-        
-        return str(filepath)
-    
-    def _export_txt(
-        self,
-        timestamp: str,
-        agent_id: str,
-        model: str,
-        model_display: str,
-        messages: List[Dict[str, Any]],
-        export_dir: Path
-    ) -> str:
-        """Export to plain text format"""
-        filename = f"conversation_{timestamp}.txt"
-        filepath = export_dir / filename
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            # Header
-            f.write(f"OpenAI {model_display} Chat Agent Conversation Export\n")
-            f.write("=" * 60 + "\n")
-            f.write(f"Agent ID: {agent_id}\n")
-            f.write(f"Model: {model}\n")
-            f.write(f"Exported: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 60 + "\n\n")
-            
-            # Messages
-            for msg in messages:
-                timestamp_str = datetime.fromisoformat(msg["timestamp"]).strftime("%Y-%m-%d %H:%M:%S")
-                role = msg["role"].upper()
-                content = msg["content"]
-                
-                f.write(f"[{timestamp_str}] {role}:\n")
-                f.write("-" * 40 + "\n")
-                f.write(f"{content}\n\n")
-        
-        return str(filepath)
-    
-    def _export_markdown(
-        self,
-        timestamp: str,
-        agent_id: str,
-        model: str,
-        model_display: str,
-        messages: List[Dict[str, Any]],
-        export_dir: Path
-    ) -> str:
-        """Export to Markdown format with enhanced formatting"""
-        filename = f"conversation_{timestamp}.md"
-        filepath = export_dir / filename
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            # Header
-            f.write(f"# 🧠 {model_display} Chat Agent Conversation\n\n")
-            f.write(f"**Agent ID:** `{agent_id}`  \n")
-            f.write(f"**Model:** `{model}`  \n")
-            f.write(f"**Exported:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  \n\n")
-            
-            # Table of Contents
-            f.write("## 📋 Table of Contents\n\n")
-            for i, msg in enumerate(messages, 1):
-                role_emoji = "👤" if msg["role"] == "user" else "🤖"
-                timestamp_str = datetime.fromisoformat(msg["timestamp"]).strftime("%H:%M:%S")
-                preview = msg["content"][:50].replace('\n', ' ')
-                if len(msg["content"]) > 50:
-                    preview += "..."
-                f.write(f"{i}. [{role_emoji} {msg['role'].title()} - {timestamp_str}](#message-{i}) - {preview}\n")
-            f.write("\n---\n\n")
-            
-            # Messages
-            for i, msg in enumerate(messages, 1):
-                timestamp_str = datetime.fromisoformat(msg["timestamp"]).strftime("%Y-%m-%d %H:%M:%S")
-                role_emoji = "👤" if msg["role"] == "user" else "🤖"
-                role = msg["role"].title()
-                content = msg["content"]
-                
-                f.write(f"## {role_emoji} {role} <a id=\"message-{i}\"></a>\n\n")
-                f.write(f"**Time:** {timestamp_str}  \n")
-                f.write(f"**Length:** {len(content)} characters  \n\n")
-                
-                # Format code blocks and content
-                if "```" in content:
-                    f.write(f"{content}\n\n")
-                else:
-                    # Add blockquote formatting for better readability
-                    lines = content.split('\n')
-                    for line in lines:
-                        if line.strip():
-                            f.write(f"> {line}\n")
-                        else:
-                            f.write(">\n")
-                    f.write("\n")
-                
-                f.write("---\n\n")
-            
-            # Footer
-            f.write(f"*Generated by OpenAI {model_display} Chat Agent • {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n")
-        
-        return str(filepath)
-    
-    def _export_html(
-        self,
-        timestamp: str,
-        agent_id: str,
-        model: str,
-        model_display: str,
-        config: Any,
-        messages: List[Dict[str, Any]],
-        statistics: Dict[str, Any],
-        export_dir: Path
-    ) -> str:
-        """Export to HTML format with modern, responsive design"""
-        filename = f"conversation_{timestamp}.html"
-        filepath = export_dir / filename
-        
-        html_template = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>🧠 OpenAI {model_display} Conversation - {agent_id}</title>
-    <style>
-        :root {{
+# Buffer size for export files, so per-line writes are batched into few syscalls
+WRITE_BUFFER_SIZE = 1 << 20
+
+# orjson options matching json.dump(indent=2) for the JSON export
+_ORJSON_OPTIONS = (
+    orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_DATACLASS | orjson.OPT_NON_STR_KEYS
+    if orjson is not None else 0
+)
+
+# Messages encoded per orjson call in the JSON export, bounding the size of each encoded chunk
+JSON_BATCH_SIZE = 512
+
+# Fenced code blocks; an unclosed fence runs to the end of the message
+_CODE_FENCE_RE = re.compile(r'```(.*?)(?:```|\Z)', re.DOTALL)
+
+# Capitalized words counted as conversation topics
+_TOPIC_RE = re.compile(r'\b[A-Z][a-z]+\b')
+
+# Blockquote lines holding only whitespace, rendered as a bare '>'
+_BLANK_QUOTE_RE = re.compile(r'^> [^\S\n]*$', re.MULTILINE)
+
+# Static stylesheet and script for HTML exports, shared by every export
+_HTML_CSS = """        :root {
             --primary-color: #6366f1;
             --secondary-color: #f8fafc;
             --accent-color: #10b981;
@@ -229,42 +63,42 @@ class ConversationExporter:
             --shadow-md: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
             --shadow-lg: 0 10px 15px -3px rgba(0, 0, 0, 0.1);
             --shadow-xl: 0 20px 25px -5px rgba(0, 0, 0, 0.1);
-        }}
+        }
 
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
 
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', 'Roboto', 'Oxygen', 'Ubuntu', 'Cantarell', sans-serif;
             line-height: 1.6;
             color: var(--text-primary);
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
             padding: 1rem;
-        }}
+        }
 
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: white;
             border-radius: 1rem;
             box-shadow: var(--shadow-xl);
             overflow: hidden;
-        }}
+        }
 
-        .header {{
+        .header {
             background: linear-gradient(135deg, var(--primary-color) 0%, var(--assistant-bg) 100%);
             color: white;
             padding: 2rem;
             text-align: center;
             position: relative;
             overflow: hidden;
-        }}
+        }
 
-        .header::before {{
+        .header::before {
             content: '';
             position: absolute;
             top: 0;
@@ -273,65 +107,65 @@ class ConversationExporter:
             bottom: 0;
             background: url('data:image/svg+xml,<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100"><defs><pattern id="grid" width="10" height="10" patternUnits="userSpaceOnUse"><path d="M 10 0 L 0 0 0 10" fill="none" stroke="rgba(255,255,255,0.1)" stroke-width="0.5"/></pattern></defs><rect width="100" height="100" fill="url(%23grid)"/></svg>');
             opacity: 0.1;
-        }}
+        }
 
-        .header-content {{
+        .header-content {
             position: relative;
             z-index: 1;
-        }}
+        }
 
-        .header h1 {{
+        .header h1 {
             font-size: 2.5rem;
             margin-bottom: 0.5rem;
             font-weight: 800;
-        }}
+        }
 
-        .header-subtitle {{
+        .header-subtitle {
             font-size: 1.2rem;
             opacity: 0.9;
             margin-bottom: 1.5rem;
-        }}
+        }
 
-        .header-info {{
+        .header-info {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
             gap: 1rem;
             margin-top: 2rem;
             font-size: 0.95rem;
-        }}
+        }
 
-        .info-card {{
+        .info-card {
             background: rgba(255, 255, 255, 0.1);
             padding: 1rem;
             border-radius: 0.5rem;
             backdrop-filter: blur(10px);
-        }}
+        }
 
-        .info-label {{
+        .info-label {
             font-weight: 600;
             margin-bottom: 0.25rem;
-        }}
+        }
 
-        .stats {{
+        .stats {
             background: var(--secondary-color);
             padding: 2rem;
             border-bottom: 1px solid var(--border-color);
-        }}
+        }
 
-        .stats h2 {{
+        .stats h2 {
             text-align: center;
             margin-bottom: 1.5rem;
             color: var(--text-primary);
             font-size: 1.5rem;
-        }}
+        }
 
-        .stats-grid {{
+        .stats-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
             gap: 1rem;
-        }}
+        }
 
-        .stat-card {{
+        .stat-card {
             text-align: center;
             padding: 1.5rem;
             background: white;
@@ -339,50 +173,50 @@ class ConversationExporter:
             box-shadow: var(--shadow-sm);
             border: 1px solid var(--border-color);
             transition: all 0.2s ease;
-        }}
+        }
 
-        .stat-card:hover {{
+        .stat-card:hover {
             transform: translateY(-2px);
             box-shadow: var(--shadow-md);
-        }}
+        }
 
-        .stat-value {{
+        .stat-value {
             font-size: 2rem;
             font-weight: 800;
             color: var(--primary-color);
             margin-bottom: 0.25rem;
-        }}
+        }
 
-        .stat-label {{
+        .stat-label {
             font-size: 0.85rem;
             color: var(--text-secondary);
             font-weight: 500;
-        }}
+        }
 
-        .messages {{
+        .messages {
             padding: 2rem;
             max-height: 70vh;
             overflow-y: auto;
-        }}
+        }
 
-        .message {{
+        .message {
             margin-bottom: 2rem;
             display: flex;
             align-items: flex-start;
             gap: 1rem;
             animation: fadeIn 0.3s ease;
-        }}
+        }
 
-        @keyframes fadeIn {{
-            from {{ opacity: 0; transform: translateY(20px); }}
-            to {{ opacity: 1; transform: translateY(0); }}
-        }}
+        @keyframes fadeIn {
+            from { opacity: 0; transform: translateY(20px); }
+            to { opacity: 1; transform: translateY(0); }
+        }
 
-        .message.user {{
+        .message.user {
             flex-direction: row-reverse;
-        }}
+        }
 
-        .message-avatar {{
+        .message-avatar {
             width: 3.5rem;
             height: 3.5rem;
             border-radius: 50%;
@@ -394,17 +228,17 @@ class ConversationExporter:
             color: white;
             flex-shrink: 0;
             box-shadow: var(--shadow-md);
-        }}
+        }
 
-        .message.user .message-avatar {{
+        .message.user .message-avatar {
             background: linear-gradient(135deg, var(--user-bg) 0%, #2563eb 100%);
-        }}
+        }
 
-        .message.assistant .message-avatar {{
+        .message.assistant .message-avatar {
             background: linear-gradient(135deg, var(--assistant-bg) 0%, #7c3aed 100%);
-        }}
+        }
 
-        .message-content {{
+        .message-content {
             flex: 1;
             background: white;
             border: 1px solid var(--border-color);
@@ -413,63 +247,63 @@ class ConversationExporter:
             box-shadow: var(--shadow-sm);
             position: relative;
             transition: all 0.2s ease;
-        }}
+        }
 
-        .message-content:hover {{
+        .message-content:hover {
             box-shadow: var(--shadow-md);
-        }}
+        }
 
-        .message.user .message-content {{
+        .message.user .message-content {
             background: linear-gradient(135deg, #eff6ff 0%, #dbeafe 100%);
             border-color: var(--user-bg);
-        }}
+        }
 
-        .message.assistant .message-content {{
+        .message.assistant .message-content {
             background: linear-gradient(135deg, #faf5ff 0%, #f3e8ff 100%);
             border-color: var(--assistant-bg);
-        }}
+        }
 
-        .message-header {{
+        .message-header {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 1rem;
             padding-bottom: 0.75rem;
             border-bottom: 1px solid var(--border-color);
-        }}
+        }
 
-        .message-role {{
+        .message-role {
             font-weight: 700;
             text-transform: capitalize;
             font-size: 1.1rem;
-        }}
+        }
 
-        .message-meta {{
+        .message-meta {
             display: flex;
             gap: 1rem;
             font-size: 0.8rem;
             color: var(--text-secondary);
-        }}
+        }
 
-        .message-time {{
+        .message-time {
             display: flex;
             align-items: center;
             gap: 0.25rem;
-        }}
+        }
 
-        .message-length {{
+        .message-length {
             display: flex;
             align-items: center;
             gap: 0.25rem;
-        }}
+        }
 
-        .message-text {{
+        .message-text {
             white-space: pre-wrap;
             word-wrap: break-word;
             line-height: 1.7;
-        }}
+        }
 
-        .code-block {{
+        .code-block {
             background: var(--code-bg);
             border: 1px solid var(--border-color);
             border-radius: 0.5rem;
@@ -479,71 +313,71 @@ class ConversationExporter:
             font-family: 'Monaco', 'Menlo', 'Consolas', monospace;
             font-size: 0.9rem;
             line-height: 1.4;
-        }}
+        }
 
-        .footer {{
+        .footer {
             background: var(--secondary-color);
             padding: 2rem;
             text-align: center;
             font-size: 0.9rem;
             color: var(--text-secondary);
             border-top: 1px solid var(--border-color);
-        }}
+        }
 
-        .footer-links {{
+        .footer-links {
             margin-top: 1rem;
             display: flex;
             justify-content: center;
             gap: 2rem;
-        }}
+        }
 
-        .footer-link {{
+        .footer-link {
             color: var(--primary-color);
             text-decoration: none;
             font-weight: 500;
-        }}
+        }
 
-        .footer-link:hover {{
+        .footer-link:hover {
             text-decoration: underline;
-        }}
+        }
 
-        @media (max-width: 768px) {{
-            body {{
+        @media (max-width: 768px) {
+            body {
                 padding: 0.5rem;
-            }}
+            }
 
-            .header {{
+            .header {
                 padding: 1.5rem;
-            }}
+            }
 
-            .header h1 {{
+            .header h1 {
                 font-size: 2rem;
-            }}
+            }
 
-            .header-info {{
+            .header-info {
                 grid-template-columns: 1fr;
-            }}
+            }
 
-            .stats {{
+            .stats {
                 padding: 1.5rem;
-            }}
+            }
 
-            .messages {{
+            .messages {
                 padding: 1rem;
-            }}
+            }
 
-            .message-content {{
+            .message-content {
                 padding: 1rem;
-            }}
+            }
 
-            .message-avatar {{
+            .message-avatar {
                 width: 3rem;
                 height: 3rem;
                 font-size: 1.2rem;
-            }}
-        }}
+            }
+        }
 
-        .scroll-indicator {{
+        .scroll-indicator {
             position: fixed;
             top: 0;
             left: 0;
@@ -551,15 +385,355 @@ class ConversationExporter:
             height: 4px;
             background: rgba(99, 102, 241, 0.3);
             z-index: 1000;
-        }}
+        }
 
-        .scroll-progress {{
+        .scroll-progress {
             height: 100%;
             background: linear-gradient(90deg, var(--primary-color), var(--assistant-bg));
             width: 0%;
             transition: width 0.1s ease;
-        }}
-    </style>
+        }
+"""
+
+_HTML_JS = """        // Scroll progress indicator
+        window.addEventListener('scroll', function() {
+            const scrollProgress = document.getElementById('scrollProgress');
+            const scrollTop = document.documentElement.scrollTop || document.body.scrollTop;
+            const scrollHeight = document.documentElement.scrollHeight - document.documentElement.clientHeight;
+            const scrollPercentage = (scrollTop / scrollHeight) * 100;
+            scrollProgress.style.width = scrollPercentage + '%';
+        });
+
+        // Smooth scroll to top
+        function scrollToTop() {
+            window.scrollTo({ top: 0, behavior: 'smooth' });
+        }
+
+        // Add copy functionality to code blocks
+        document.addEventListener('DOMContentLoaded', function() {
+            const codeBlocks = document.querySelectorAll('.code-block');
+            codeBlocks.forEach(function(block) {
+                block.addEventListener('click', function() {
+                    navigator.clipboard.writeText(block.textContent);
+                    // Visual feedback
+                    const originalBg = block.style.backgroundColor;
+                    block.style.backgroundColor = '#10b981';
+                    setTimeout(() => {
+                        block.style.backgroundColor = originalBg;
+                    }, 200);
+                });
+                block.style.cursor = 'pointer';
+                block.title = 'Click to copy';
+            });
+        });
+"""
+
+
+@dataclass
+class ConversationAnalysis:
+    """Conversation metrics gathered in a single pass over the messages"""
+    total_chars: int
+    topic_counts: Counter
+    message_types: Dict[str, int]
+    role_counts: Dict[str, int]
+    
+    @property
+    def tokens_estimate(self) -> int:
+        """Rough token estimation (4 characters ≈ 1 token)"""
+        return self.total_chars // 4
+    
+    @property
+    def topics(self) -> List[str]:
+        """Most frequent topics, most common first"""
+        return [word for word, count in self.topic_counts.most_common(10)]
+
+
+class ConversationExporter:
+    """Advanced conversation exporter with multiple format support"""
+    
+    # Flattens line breaks to spaces for one-line CSV cells
+    _NEWLINE_TABLE = str.maketrans({'\n': ' ', '\r': ' '})
+    
+    def __init__(self):
+        self.supported_formats = ["json", "txt", "md", "html", "csv", "xml"]
+        # (messages, length, last message, analysis) of the last analyzed conversation
+        self._analysis_cache: Optional[Tuple[list, int, Any, ConversationAnalysis]] = None
+    
+    def export_conversation(
+        self, 
+        format_type: str,
+        agent_id: str,
+        model: str,
+        model_display: str,
+        config: Any,
+        messages: List[Dict[str, Any]],
+        statistics: Dict[str, Any],
+        export_dir: Path,
+        metadata: bool = True
+    ) -> str:
+        """Export conversation to specified format"""
+        
+        if format_type not in self.supported_formats:
+            raise ValueError(f"Unsupported export format: {format_type}")
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        export_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Route to appropriate export method
+        if format_type == "json":
+            return self._export_json(timestamp, agent_id, model, config, messages, statistics, export_dir, metadata)
+        elif format_type == "txt":
+            return self._export_txt(timestamp, agent_id, model, model_display, messages, export_dir)
+        elif format_type == "md":
+            return self._export_markdown(timestamp, agent_id, model, model_display, messages, export_dir)
+        elif format_type == "html":
+            return self._export_html(timestamp, agent_id, model, model_display, config, messages, statistics, export_dir)
+        elif format_type == "csv":
+            return self._export_csv(timestamp, agent_id, model, messages, export_dir)
+        elif format_type == "xml":
+            return self._export_xml(timestamp, agent_id, model, config, messages, statistics, export_dir)
+    
+    def export_all(
+        self,
+        formats: List[str],
+        agent_id: str,
+        model: str,
+        model_display: str,
+        config: Any,
+        messages: List[Dict[str, Any]],
+        statistics: Dict[str, Any],
+        export_dir: Path
+    ) -> Dict[str, Union[str, Exception]]:
+        """Export to several formats concurrently, mapping each format to its path or error"""
+        if not formats:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(len(formats), 4)) as executor:
+            futures = {
+                fmt: executor.submit(
+                    self.export_conversation, fmt, agent_id, model, model_display,
+                    config, messages, statistics, export_dir
+                )
+                for fmt in formats
+            }
+        
+        results: Dict[str, Union[str, Exception]] = {}
+        for fmt, future in futures.items():
+            error = future.exception()
+            results[fmt] = error if error is not None else future.result()
+        return results
+    
+    def _export_json(
+        self, 
+        timestamp: str,
+        agent_id: str,
+        model: str,
+        config: Any,
+        messages: List[Dict[str, Any]],
+        statistics: Dict[str, Any],
+        export_dir: Path,
+        metadata: bool = True
+    ) -> str:
+        """Export to JSON format with comprehensive metadata"""
+        filename = f"conversation_{timestamp}.json"
+        filepath = export_dir / filename
+        
+        if metadata:
+            analysis = self._cached_analysis(messages)
+            metadata_info = {
+                "total_tokens_estimate": analysis.tokens_estimate,
+                "conversation_topics": analysis.topics,
+                "message_types": analysis.message_types
+            }
+        else:
+            metadata_info = {}
+        
+        export_data = {
+            "export_info": {
+                "version": "2.0",
+                "exported_at": datetime.now().isoformat(),
+                "exporter": "Unified OpenAI Agent System",
+                "format": "json"
+            },
+            "agent_info": {
+                "agent_id": agent_id,
+                "model": model,
+                # orjson serializes dataclasses natively; json needs a dict
+                "config": config if orjson is not None else self._config_dict(config)
+            },
+            "conversation": {
+                "messages": messages,
+                "statistics": statistics
+            },
+            "metadata": metadata_info
+        }
+        
+        if orjson is not None:
+            self._stream_json(filepath, export_data)
+        else:
+            with open(filepath, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+                json.dump(export_data, f, indent=2, ensure_ascii=False, default=str)
+        
+        return str(filepath)
+    
+    def _stream_json(self, filepath: Path, export_data: Dict[str, Any]):
+        """Write the JSON export with orjson, serializing the messages in batches"""
+        
+        def block(obj: Any, indent: bytes) -> bytes:
+            # orjson escapes newlines inside strings, so raw ones are only indentation
+            data = orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS)
+            return data.replace(b'\n', b'\n' + indent)
+        
+        messages = export_data["conversation"]["messages"]
+        statistics = export_data["conversation"]["statistics"]
+        
+        with open(filepath, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(b'{\n  "export_info": ')
+            f.write(block(export_data["export_info"], b'  '))
+            f.write(b',\n  "agent_info": ')
+            f.write(block(export_data["agent_info"], b'  '))
+            f.write(b',\n  "conversation": {\n    "messages": [')
+            separator = b'\n      '
+            for start in range(0, len(messages), JSON_BATCH_SIZE):
+                # Encode a batch as one array, then drop its "[\n  " and "\n]" so
+                # the items sit at the messages array's indentation
+                data = orjson.dumps(messages[start:start + JSON_BATCH_SIZE], default=str, option=_ORJSON_OPTIONS)
+                f.write(separator)
+                f.write(data[4:-2].replace(b'\n', b'\n    '))
+                separator = b',\n      '
+            f.write(b'\n    ],\n    "statistics": ' if messages else b'],\n    "statistics": ')
+            f.write(block(statistics, b'    '))
+            f.write(b'\n  },\n  "metadata": ')
+            f.write(block(export_data["metadata"], b'  '))
+            f.write(b'\n}')
+    
+    def _export_txt(
+        self,
+        timestamp: str,
+        agent_id: str,
+        model: str,
+        model_display: str,
+        messages: List[Dict[str, Any]],
+        export_dir: Path
+    ) -> str:
+        """Export to plain text format"""
+        filename = f"conversation_{timestamp}.txt"
+        filepath = export_dir / filename
+        
+        parts: List[str] = []
+        
+        # Header
+        parts.append(f"OpenAI {model_display} Chat Agent Conversation Export\n")
+        parts.append("=" * 60 + "\n")
+        parts.append(f"Agent ID: {agent_id}\n")
+        parts.append(f"Model: {model}\n")
+        parts.append(f"Exported: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        parts.append("=" * 60 + "\n\n")
+        
+        # Messages
+        for msg in messages:
+            timestamp_str = datetime.fromisoformat(msg["timestamp"]).strftime("%Y-%m-%d %H:%M:%S")
+            role = msg["role"].upper()
+            content = msg["content"]
+            
+            parts.append(f"[{timestamp_str}] {role}:\n")
+            parts.append("-" * 40 + "\n")
+            parts.append(f"{content}\n\n")
+        
+        filepath.write_text("".join(parts), encoding='utf-8')
+        
+        return str(filepath)
+    
+    def _export_markdown(
+        self,
+        timestamp: str,
+        agent_id: str,
+        model: str,
+        model_display: str,
+        messages: List[Dict[str, Any]],
+        export_dir: Path
+    ) -> str:
+        """Export to Markdown format with enhanced formatting"""
+        filename = f"conversation_{timestamp}.md"
+        filepath = export_dir / filename
+        
+        parts: List[str] = []
+        toc_parts: List[str] = []
+        body_parts: List[str] = []
+        now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        # Header
+        parts.append(f"# 🧠 {model_display} Chat Agent Conversation\n\n")
+        parts.append(f"**Agent ID:** `{agent_id}`  \n")
+        parts.append(f"**Model:** `{model}`  \n")
+        parts.append(f"**Exported:** {now_str}  \n\n")
+        
+        # Table of Contents and message sections, built in one pass
+        for i, msg in enumerate(messages, 1):
+            timestamp_str = datetime.fromisoformat(msg["timestamp"]).strftime("%Y-%m-%d %H:%M:%S")
+            role = msg["role"]
+            role_emoji = "👤" if role == "user" else "🤖"
+            role = role.title()
+            content = msg["content"]
+            
+            preview = content[:50].replace('\n', ' ')
+            if len(content) > 50:
+                preview += "..."
+            toc_parts.append(f"{i}. [{role_emoji} {role} - {timestamp_str[-8:]}](#message-{i}) - {preview}\n")
+            
+            body_parts.append(f"## {role_emoji} {role} <a id=\"message-{i}\"></a>\n\n")
+            body_parts.append(f"**Time:** {timestamp_str}  \n")
+            body_parts.append(f"**Length:** {len(content)} characters  \n\n")
+            
+            # Format code blocks and content
+            if "```" in content:
+                body_parts.append(f"{content}\n\n")
+            else:
+                # Add blockquote formatting for better readability
+                quoted = "> " + content.replace("\n", "\n> ")
+                body_parts.append(_BLANK_QUOTE_RE.sub(">", quoted))
+                body_parts.append("\n\n")
+            
+            body_parts.append("---\n\n")
+        
+        parts.append("## 📋 Table of Contents\n\n")
+        parts.extend(toc_parts)
+        parts.append("\n---\n\n")
+        parts.extend(body_parts)
+        
+        # Footer
+        parts.append(f"*Generated by OpenAI {model_display} Chat Agent • {now_str}*\n")
+        
+        filepath.write_text("".join(parts), encoding='utf-8')
+        
+        return str(filepath)
+    
+    def _export_html(
+        self,
+        timestamp: str,
+        agent_id: str,
+        model: str,
+        model_display: str,
+        config: Any,
+        messages: List[Dict[str, Any]],
+        statistics: Dict[str, Any],
+        export_dir: Path
+    ) -> str:
+        """Export to HTML format with modern, responsive design"""
+        filename = f"conversation_{timestamp}.html"
+        filepath = export_dir / filename
+        now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        html_parts = [f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>🧠 OpenAI {model_display} Conversation - {agent_id}</title>
+    <style>
+""",
+            _HTML_CSS,
+            f"""    </style>
 </head>
 <body>
     <div class="scroll-indicator">
@@ -586,7 +760,7 @@ class ConversationExporter:
                     </div>
                     <div class="info-card">
                         <div class="info-label">Exported</div>
-                        <div>{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</div>
+                        <div>{now_str}</div>
                     </div>
                     <div class="info-card">
                         <div class="info-label">Temperature</div>
@@ -626,7 +800,7 @@ class ConversationExporter:
             </div>
         </div>
 
-        <div class="messages">"""
+        <div class="messages">"""]
 
         # Add messages
         for i, msg in enumerate(messages):
@@ -634,23 +808,16 @@ class ConversationExporter:
             role = msg["role"]
             content = msg["content"]
             
-            # Escape HTML and preserve formatting
-            content_escaped = html.escape(content)
+            # Escape HTML and preserve formatting; quotes are safe in element text
+            content_escaped = html.escape(content, quote=False)
             
             # Enhanced code block detection
             if '```' in content_escaped:
-                parts = content_escaped.split('```')
-                formatted_content = ""
-                for j, part in enumerate(parts):
-                    if j % 2 == 1:  # Code block
-                        formatted_content += f'<div class="code-block">{part}</div>'
-                    else:  # Regular text
-                        formatted_content += part
-                content_escaped = formatted_content
+                content_escaped = _CODE_FENCE_RE.sub(r'<div class="code-block">\1</div>', content_escaped)
             
             avatar_text = "👤" if role == "user" else "🤖"
             
-            html_template += f"""
+            html_parts.append(f"""
             <div class="message {role}">
                 <div class="message-avatar">{avatar_text}</div>
                 <div class="message-content">
@@ -663,15 +830,15 @@ class ConversationExporter:
                     </div>
                     <div class="message-text">{content_escaped}</div>
                 </div>
-            </div>"""
+            </div>""")
 
         # Close HTML
-        html_template += f"""
+        html_parts.extend((f"""
         </div>
 
         <div class="footer">
             <p>Generated by OpenAI {model_display} Chat Agent</p>
-            <p>Agent ID: <strong>{agent_id}</strong> • {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+            <p>Agent ID: <strong>{agent_id}</strong> • {now_str}</p>
             <div class="footer-links">
                 <a href="#" class="footer-link" onclick="window.print()">🖨️ Print</a>
                 <a href="#" class="footer-link" onclick="scrollToTop()">⬆️ Top</a>
@@ -680,43 +847,13 @@ class ConversationExporter:
     </div>
 
     <script>
-        // Scroll progress indicator
-        window.addEventListener('scroll', function() {{
-            const scrollProgress = document.getElementById('scrollProgress');
-            const scrollTop = document.documentElement.scrollTop || document.body.scrollTop;
-            const scrollHeight = document.documentElement.scrollHeight - document.documentElement.clientHeight;
-            const scrollPercentage = (scrollTop / scrollHeight) * 100;
-            scrollProgress.style.width = scrollPercentage + '%';
-        }});
-
-        // Smooth scroll to top
-        function scrollToTop() {{
-            window.scrollTo({{ top: 0, behavior: 'smooth' }});
-        }}
-
-        // Add copy functionality to code blocks
-        document.addEventListener('DOMContentLoaded', function() {{
-            const codeBlocks = document.querySelectorAll('.code-block');
-            codeBlocks.forEach(function(block) {{
-                block.addEventListener('click', function() {{
-                    navigator.clipboard.writeText(block.textContent);
-                    // Visual feedback
-                    const originalBg = block.style.backgroundColor;
-                    block.style.backgroundColor = '#10b981';
-                    setTimeout(() => {{
-                        block.style.backgroundColor = originalBg;
-                    }}, 200);
-                }});
-                block.style.cursor = 'pointer';
-                block.title = 'Click to copy';
-            }});
-        }});
-    </script>
+""",
+            _HTML_JS,
+            """    </script>
 </body>
-</html>"""
+</html>"""))
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(html_template)
+        filepath.write_text("".join(html_parts), encoding='utf-8')
         
         return str(filepath)
     
@@ -732,9 +869,7 @@ class ConversationExporter:
         filename = f"conversation_{timestamp}.csv"
         filepath = export_dir / filename
         
-        import csv
-        
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+        with open(filepath, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
             writer = csv.writer(f)
             
             # Header
@@ -744,20 +879,23 @@ class ConversationExporter:
             ])
             
             # Data rows
-            for i, msg in enumerate(messages):
-                content = msg['content'].replace('\n', ' ').replace('\r', ' ')
-                word_count = len(content.split())
-                
-                writer.writerow([
-                    msg['timestamp'],
-                    msg['role'],
-                    content,
-                    len(msg['content']),
-                    word_count,
-                    i + 1,
-                    agent_id,
-                    model
-                ])
+            def rows():
+                for i, msg in enumerate(messages):
+                    content = msg['content'].translate(self._NEWLINE_TABLE)
+                    word_count = len(content.split())
+                    
+                    yield [
+                        msg['timestamp'],
+                        msg['role'],
+                        content,
+                        len(msg['content']),
+                        word_count,
+                        i + 1,
+                        agent_id,
+                        model
+                    ]
+                    
+            writer.writerows(rows())
         
         return str(filepath)
     
@@ -775,62 +913,107 @@ class ConversationExporter:
         filename = f"conversation_{timestamp}.xml"
         filepath = export_dir / filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
+        with open(filepath, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            gen = XMLGenerator(f, encoding='utf-8', short_empty_elements=False)
+            
+            def element(indent: str, name: str, text: str):
+                f.write(indent)
+                gen.startElement(name, {})
+                gen.characters(text)
+                gen.endElement(name)
+                f.write('\n')
+            
             f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-            f.write('<conversation>\n')
-            f.write(f'  <metadata>\n')
-            f.write(f'    <agent_id>{html.escape(agent_id)}</agent_id>\n')
-            f.write(f'    <model>{html.escape(model)}</model>\n')
-            f.write(f'    <exported_at>{datetime.now().isoformat()}</exported_at>\n')
-            f.write(f'  </metadata>\n')
-            f.write(f'  <statistics>\n')
+            gen.startElement('conversation', {})
+            f.write('\n  ')
+            gen.startElement('metadata', {})
+            f.write('\n')
+            element('    ', 'agent_id', agent_id)
+            element('    ', 'model', model)
+            element('    ', 'exported_at', datetime.now().isoformat())
+            f.write('  ')
+            gen.endElement('metadata')
+            f.write('\n  ')
+            gen.startElement('statistics', {})
+            f.write('\n')
             for key, value in statistics.items():
-                f.write(f'    <{key}>{html.escape(str(value))}</{key}>\n')
-            f.write(f'  </statistics>\n')
-            f.write(f'  <messages>\n')
+                element('    ', key, str(value))
+            f.write('  ')
+            gen.endElement('statistics')
+            f.write('\n  ')
+            gen.startElement('messages', {})
+            f.write('\n')
             
-            for i, msg in enumerate(messages):
-                f.write(f'    <message index="{i + 1}">\n')
-                f.write(f'      <timestamp>{msg["timestamp"]}</timestamp>\n')
-                f.write(f'      <role>{html.escape(msg["role"])}</role>\n')
-                f.write(f'      <content><![CDATA[{msg["content"]}]]></content>\n')
-                f.write(f'      <character_count>{len(msg["content"])}</character_count>\n')
-                f.write(f'    </message>\n')
+            for i, msg in enumerate(messages, 1):
+                content = msg["content"]
+                f.write('    ')
+                gen.startElement('message', {'index': str(i)})
+                f.write('\n')
+                element('      ', 'timestamp', msg["timestamp"])
+                element('      ', 'role', msg["role"])
+                # CDATA cannot contain "]]>", so split it across two sections
+                f.write(f'      <content><![CDATA[{content.replace("]]>", "]]]]><![CDATA[>")}]]></content>\n')
+                element('      ', 'character_count', str(len(content)))
+                f.write('    ')
+                gen.endElement('message')
+                f.write('\n')
             
-            f.write(f'  </messages>\n')
-            f.write('</conversation>\n')
+            f.write('  ')
+            gen.endElement('messages')
+            f.write('\n')
+            gen.endElement('conversation')
+            f.write('\n')
         
         return str(filepath)
     
-    def _estimate_tokens(self, messages: List[Dict[str, Any]]) -> int:
-        """Rough token estimation (4 characters ≈ 1 token)"""
-        total_chars = sum(len(msg['content']) for msg in messages)
-        return total_chars // 4
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _field_names(config_type: type) -> Tuple[str, ...]:
+        """Field names of a dataclass type"""
+        return tuple(f.name for f in fields(config_type))
+    
+    def _config_dict(self, config: Any) -> Any:
+        """Shallow dict of a config object for the json module"""
+        if is_dataclass(config) and not isinstance(config, type):
+            return {name: getattr(config, name) for name in self._field_names(type(config))}
+        if hasattr(config, '__dict__'):
+            return vars(config)
+        return config
     
-    def _extract_topics(self, messages: List[Dict[str, Any]]) -> List[str]:
-        """Extract potential topics from conversation"""
-        # Simple keyword extraction
-        import re
-        
-        all_text = ' '.join(msg['content'] for msg in messages if msg['role'] == 'user')
-        words = re.findall(r'\b[A-Z][a-z]+\b', all_text)
-        
-        # Count frequency and return top topics
-        from collections import Counter
-        word_counts = Counter(words)
-        return [word for word, count in word_counts.most_common(10)]
+    def _cached_analysis(self, messages: List[Dict[str, Any]]) -> ConversationAnalysis:
+        """Analyze messages, reusing the last result while the list is unchanged"""
+        last = messages[-1] if messages else None
+        cached = self._analysis_cache
+        if cached is not None and cached[0] is messages and cached[1] == len(messages) and cached[2] is last:
+            return cached[3]
+        
+        analysis = self._analyze(messages)
+        self._analysis_cache = (messages, len(messages), last, analysis)
+        return analysis
     
-    def _analyze_message_types(self, messages: List[Dict[str, Any]]) -> Dict[str, int]:
-        """Analyze types of messages in the conversation"""
+    def _analyze(self, messages: List[Dict[str, Any]]) -> ConversationAnalysis:
+        """Collect size, topic, type and role metrics in one pass"""
+        total_chars = 0
+        topic_counts = Counter()
         types = {
             'questions': 0,
             'code_blocks': 0,
             'long_messages': 0,
             'short_messages': 0
         }
+        role_counts = Counter()
         
         for msg in messages:
             content = msg['content']
+            role = msg['role']
+            length = len(content)
+            
+            total_chars += length
+            role_counts[role] += 1
+            
+            # Simple keyword extraction from user messages
+            if role == 'user':
+                topic_counts.update(m.group() for m in _TOPIC_RE.finditer(content))
             
             # Count questions
             if '?' in content:
@@ -841,9 +1024,9 @@ class ConversationExporter:
                 types['code_blocks'] += 1
             
             # Count by length
-            if len(content) > 500:
+            if length > 500:
                 types['long_messages'] += 1
-            elif len(content) < 50:
+            elif length < 50:
                 types['short_messages'] += 1
         
-        return types
\ No newline at end of file
+        return ConversationAnalysis(total_chars, topic_counts, types, dict(role_counts))
@@ -16,34 +16,37 @@ Usage:
 import sys
 import os
 import argparse
-import json
-import yaml
 from pathlib import Path
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple
 
-# Import our modules
-from agent import UnifiedOpenAIAgent
-from config import AgentConfig, ModelConfig, ConfigManager
-from utils import ColorManager, UIEnhancer, ValidationUtils
-from export import ConversationExporter
+# Import our modules; agent (and with it export) is imported when first needed
+from config import ModelConfig, ConfigManager, load_config_file
+from utils import (
+    ColorManager, UIEnhancer, ValidationUtils, StreamPrinter, LineReader, format_timestamp,
+    load_history_meta
+)
+
+if TYPE_CHECKING:
+    from agent import UnifiedOpenAIAgent
 
 
 class UnifiedCLI:
     """Main CLI interface with enhanced user experience"""
     
+    # Model used when --model is not given
+    DEFAULT_MODEL = "o1"
+    
     def __init__(self):
         self.colors = ColorManager()
         self.ui = UIEnhancer()
         self.validator = ValidationUtils()
         self.version = "2.0.0"
+        self._chat_commands = self._build_chat_commands()
+        self._agent_commands = self._build_agent_commands()
         
-    def create_argument_parser(self) -> argparse.ArgumentParser:
-        """Create comprehensive argument parser"""
-        parser = argparse.ArgumentParser(
-            description="Unified OpenAI Agent System - Advanced AI Chat Interface",
-            formatter_class=argparse.RawDescriptionHelpFormatter,
-            epilog=f"""
+    def _epilog(self) -> str:
+        """Colorized usage examples shown after the --help text"""
+        return f"""
 {self.colors.highlight('Examples:')}
   {self.colors.dim('Basic Usage:')}
   %(prog)s --agent-id my-agent --model o1         # Start chat with O1 model
@@ -71,7 +74,14 @@ class UnifiedCLI:
   • O3: Latest generation model (20min timeout)  
   • O3-mini: Compact model (10min timeout)
   • O4-mini: Efficient model (8min timeout)
-            """,
+            """
+    
+    def create_argument_parser(self, epilog: bool = True) -> argparse.ArgumentParser:
+        """Create comprehensive argument parser"""
+        parser = argparse.ArgumentParser(
+            description="Unified OpenAI Agent System - Advanced AI Chat Interface",
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+            epilog=self._epilog() if epilog else None,
             add_help=True
         )
         
@@ -79,7 +89,7 @@ class UnifiedCLI:
         parser.add_argument("--version", action="version", version=f"Unified OpenAI Agent System {self.version}")
         parser.add_argument("--agent-id", help="Agent ID for the chat session")
         parser.add_argument("--model", choices=ModelConfig.get_available_models(), 
-                          default="o1", help="OpenAI model to use (default: o1)")
+                          default=self.DEFAULT_MODEL, help=f"OpenAI model to use (default: {self.DEFAULT_MODEL})")
         
         # Information commands
         info_group = parser.add_argument_group("Information Commands")
@@ -119,10 +129,14 @@ class UnifiedCLI:
         conv_group = parser.add_argument_group("Conversation Management")
         conv_group.add_argument("--clear", action="store_true", 
                               help="Clear conversation history")
+        conv_group.add_argument("-y", "--yes", action="store_true", 
+                              help="Clear without asking for confirmation")
         conv_group.add_argument("--backup", action="store_true", 
                               help="Create backup of conversation")
         conv_group.add_argument("--search", metavar="TERM", 
                               help="Search conversation history")
+        conv_group.add_argument("--archived", action="store_true", 
+                              help="Also search messages archived by history truncation")
         
         # Advanced options
         advanced_group = parser.add_argument_group("Advanced Options")
@@ -148,40 +162,43 @@ class UnifiedCLI:
         
         # Prepare table data
         headers = ["Agent ID", "Model", "Messages", "Last Updated", "Size"]
-        rows = []
-        
-        for agent in agents:
-            updated = agent.get("updated_at", "Unknown")
-            if updated != "Unknown":
-                try:
-                    updated = datetime.fromisoformat(updated).strftime("%m-%d %H:%M")
-                except:
-                    pass
-            
-            model = agent.get('model', 'unknown')
-            model_config = ModelConfig.get_model_config(model) if model in ModelConfig.SUPPORTED_MODELS else None
-            model_display = model_config["name"] if model_config else model
-            
-            # Format file size
-            size = agent.get('history_size', 0)
-            if size > 1024*1024:
-                size_str = f"{size/(1024*1024):.1f}MB"
-            elif size > 1024:
-                size_str = f"{size/1024:.1f}KB"
-            else:
-                size_str = f"{size}B"
-            
-            rows.append([
-                agent['id'],
-                model_display,
-                str(agent.get('message_count', 0)),
-                updated,
-                size_str
-            ])
+        supported_models = ModelConfig.SUPPORTED_MODELS
+        rows = [self._agent_row(agent, supported_models) for agent in agents]
         
         self.ui.print_table(headers, rows)
         print(f"\n{self.colors.dim('💡 Use --info AGENT_ID for detailed information')}")
     
+    # (threshold, suffix) pairs for the listing's size column, largest first
+    _SIZE_UNITS = ((1024 * 1024, "MB"), (1024, "KB"))
+    
+    @classmethod
+    def _agent_row(cls, agent: Dict[str, Any], supported_models: Dict[str, Dict[str, Any]]) -> List[str]:
+        """Build one row of the agent listing table"""
+        updated = agent.get("updated_at", "Unknown")
+        if updated != "Unknown":
+            try:
+                updated = format_timestamp(updated, "%m-%d %H:%M")
+            except:
+                pass
+        
+        model = agent.get('model', 'unknown')
+        model_config = supported_models.get(model)
+        
+        size = agent.get('history_size', 0)
+        size_str = f"{size}B"
+        for threshold, suffix in cls._SIZE_UNITS:
+            if size > threshold:
+                size_str = f"{size/threshold:.1f}{suffix}"
+                break
+        
+        return [
+            agent['id'],
+            model_config["name"] if model_config else model,
+            str(agent.get('message_count', 0)),
+            updated,
+            size_str
+        ]
+    
     def show_models(self):
         """Show detailed model information"""
         self.ui.print_banner("Available OpenAI Models", "Reasoning-capable models")
@@ -223,11 +240,10 @@ class UnifiedCLI:
         config_file = agent_dir / "config.yaml"
         if config_file.exists():
             try:
-                with open(config_file) as f:
-                    config = yaml.safe_load(f)
+                config = load_config_file(config_file, use_sidecar=True)
                 
                 model = config.get('model', 'unknown')
-                model_config = ModelConfig.get_model_config(model) if model in ModelConfig.SUPPORTED_MODELS else None
+                model_config = ModelConfig.SUPPORTED_MODELS.get(model)
                 
                 self.ui.print_section("Configuration")
                 if model_config:
@@ -245,37 +261,37 @@ class UnifiedCLI:
                 print(f"{self.colors.error(f'Error loading config: {e}')}")
         
         # Show conversation statistics
-        history_file = agent_dir / "history.json"
-        if history_file.exists():
+        found = self._stat_history_file(agent_dir)
+        if found:
+            history_file, history_stat = found
             try:
-                with open(history_file) as f:
-                    history = json.load(f)
-                
-                user_msgs = len([m for m in history if m.get("role") == "user"])
-                assistant_msgs = len([m for m in history if m.get("role") == "assistant"])
-                total_chars = sum(len(m.get("content", "")) for m in history)
+                # Summary sidecar when current, otherwise a streaming pass over the file;
+                # the single stat serves both the freshness check and the size line
+                meta = load_history_meta(history_file, history_stat)
                 
                 self.ui.print_section("Conversation History")
                 
                 # Create stats table
                 stats_data = [
-                    ["Total Messages", str(len(history))],
-                    ["User Messages", str(user_msgs)],
-                    ["Assistant Messages", str(assistant_msgs)],
-                    ["Total Characters", f"{total_chars:,}"],
-                    ["File Size", f"{history_file.stat().st_size:,} bytes"]
+                    ["Total Messages", str(meta["count"])],
+                    ["User Messages", str(meta["user_count"])],
+                    ["Assistant Messages", str(meta["assistant_count"])],
+                    ["Total Characters", f"{meta['total_chars']:,}"],
+                    ["File Size", f"{history_stat.st_size:,} bytes"]
                 ]
                 
-                if history:
-                    first_msg = datetime.fromisoformat(history[0]["timestamp"])
-                    last_msg = datetime.fromisoformat(history[-1]["timestamp"])
+                if meta["count"]:
+                    from datetime import datetime
+                    first_msg = datetime.fromisoformat(meta["first_ts"])
+                    last_msg = datetime.fromisoformat(meta["last_ts"])
                     stats_data.extend([
                         ["First Message", first_msg.strftime('%Y-%m-%d %H:%M:%S')],
                         ["Last Message", last_msg.strftime('%Y-%m-%d %H:%M:%S')]
                     ])
                 
+                c = self.colors
                 for stat, value in stats_data:
-                    print(f"  {self.colors.bold(stat + ':')} {value}")
+                    print(f"  {c.bright_code}{stat}:{c.reset_code} {value}")
                     
             except Exception as e:
                 print(f"{self.colors.error(f'Error loading history: {e}')}")
@@ -284,17 +300,21 @@ class UnifiedCLI:
         
         # Show directory structure
         self.ui.print_section("Files")
-        for item in sorted(agent_dir.rglob("*")):
-            if item.is_file():
-                size = item.stat().st_size
-                size_str = f"{size:,}" if size < 1024 else f"{size/1024:.1f}K"
-                rel_path = item.relative_to(agent_dir)
-                print(f"  {rel_path} ({size_str})")
-    
-    def interactive_chat(self, agent: UnifiedOpenAIAgent):
+        files, total = self._list_agent_files(agent_dir)
+        for rel_parts, size in files:
+            size_str = f"{size:,}" if size < 1024 else f"{size/1024:.1f}K"
+            print(f"  {'/'.join(rel_parts)} ({size_str})")
+        
+        if total > len(files):
+            print(f"{self.colors.dim(f'... and {total - len(files)} more files')}")
+    
+    def interactive_chat(self, agent: 'UnifiedOpenAIAgent'):
         """Enhanced interactive chat session"""
         model_display = agent.get_model_display_name()
         
+        # Load the HTTP stack while the user types the first message
+        agent.prewarm()
+        
         # Show welcome banner
         self.ui.print_banner(
             f"OpenAI {model_display} Chat", 
@@ -308,9 +328,13 @@ class UnifiedCLI:
         print(f"{self.colors.dim('  • Use /preset to change model behavior')}")
         print()
         
+        # The prompt does not change during the session
+        c = self.colors
+        reader = LineReader(f"{c.cyan_code}❯{c.reset_code} {c.reset_code}")
+        
         while True:
             try:
-                user_input = input(f"{self.colors.format_text('CYAN', '❯')} {self.colors.format_text('RESET')}").strip()
+                user_input = reader.read().strip()
                 
                 if not user_input:
                     continue
@@ -324,11 +348,11 @@ class UnifiedCLI:
                 # Regular message - send to API
                 print(f"\n{self.colors.format_text('MAGENTA', '🤖 Assistant:')} ", end="", flush=True)
                 
-                response_text = ""
                 try:
-                    for chunk in agent.call_api(user_input):
-                        print(chunk, end="", flush=True)
-                        response_text += chunk
+                    # Batch token writes; whatever is buffered is flushed when the stream ends
+                    with StreamPrinter() as out:
+                        for chunk in agent.call_api(user_input):
+                            out.write(chunk)
                 except Exception as e:
                     print(f"{self.colors.error(f'Error: {e}')}")
                 
@@ -342,76 +366,79 @@ class UnifiedCLI:
             except Exception as e:
                 print(f"\n{self.colors.error(f'Unexpected error: {e}')}")
     
-    def _handle_chat_command(self, user_input: str, agent: UnifiedOpenAIAgent) -> bool:
+    def _handle_chat_command(self, user_input: str, agent: 'UnifiedOpenAIAgent') -> bool:
         """Handle chat commands, return True if should exit"""
         command_parts = user_input[1:].split()
         command = command_parts[0].lower()
         
-        if command == 'help':
-            self._show_chat_help(agent)
-            
-        elif command == 'quit' or command == 'exit' or command == 'q':
-            print(f"{self.colors.success('Goodbye! 👋')}")
-            return True
-            
-        elif command == 'history':
-            limit = 5
-            if len(command_parts) > 1:
-                try:
-                    limit = int(command_parts[1])
-                except ValueError:
-                    print(f"{self.colors.error('Invalid number')}")
-                    return False
-            
-            self._show_recent_history(agent, limit)
-            
-        elif command == 'search':
-            if len(command_parts) < 2:
-                print(f"{self.colors.error('Usage: /search <term>')}")
-                return False
-            
-            search_term = ' '.join(command_parts[1:])
-            self._search_conversation(agent, search_term)
-            
-        elif command == 'stats':
-            self._show_conversation_stats(agent)
-            
-        elif command == 'config':
-            self._show_current_config(agent)
-            
-        elif command == 'preset':
-            if len(command_parts) < 2:
-                self._show_available_presets()
-            else:
-                self._apply_preset(agent, command_parts[1])
-                
-        elif command == 'export':
-            if len(command_parts) < 2:
-                print(f"{self.colors.error('Usage: /export <json|txt|md|html|csv|xml>')}")
-                return False
-            
-            format_type = command_parts[1].lower()
-            self._export_conversation(agent, format_type)
-            
-        elif command == 'clear':
-            self._clear_conversation_history(agent)
-            
-        elif command == 'files':
-            self._show_available_files(agent)
-            
-        elif command == 'info':
-            self.show_agent_info(agent.agent_id)
-            
-        elif command == 'model':
-            self._show_current_model_info(agent)
-            
-        else:
+        handler = self._chat_commands.get(command)
+        if handler is None:
             print(f"{self.colors.error(f'Unknown command: {command}')}")
             print(f"{self.colors.dim('Type /help for available commands')}")
+            return False
+        
+        return bool(handler(agent, command_parts[1:]))
+    
+    def _build_chat_commands(self) -> Dict[str, Any]:
+        """Map each chat command name to its handler(agent, args)"""
+        commands = {
+            'help': lambda agent, args: self._show_chat_help(agent),
+            'history': self._cmd_history,
+            'search': self._cmd_search,
+            'stats': lambda agent, args: self._show_conversation_stats(agent),
+            'config': lambda agent, args: self._show_current_config(agent),
+            'preset': self._cmd_preset,
+            'export': self._cmd_export,
+            'clear': lambda agent, args: self._clear_conversation_history(agent),
+            'files': lambda agent, args: self._show_available_files(agent),
+            'info': lambda agent, args: self.show_agent_info(agent.agent_id),
+            'model': lambda agent, args: self._show_current_model_info(agent),
+        }
+        for name in ('quit', 'exit', 'q'):
+            commands[name] = self._cmd_quit
+        return commands
+    
+    def _cmd_quit(self, agent: 'UnifiedOpenAIAgent', args: List[str]) -> bool:
+        """Leave the chat session"""
+        print(f"{self.colors.success('Goodbye! 👋')}")
+        return True
+    
+    def _cmd_history(self, agent: 'UnifiedOpenAIAgent', args: List[str]):
+        """/history [limit]"""
+        limit = 5
+        if args:
+            try:
+                limit = int(args[0])
+            except ValueError:
+                print(f"{self.colors.error('Invalid number')}")
+                return
+        
+        self._show_recent_history(agent, limit)
+    
+    def _cmd_search(self, agent: 'UnifiedOpenAIAgent', args: List[str]):
+        """/search <term>"""
+        if not args:
+            print(f"{self.colors.error('Usage: /search <term>')}")
+            return
+        
+        self._search_conversation(agent, ' '.join(args))
+    
+    def _cmd_preset(self, agent: 'UnifiedOpenAIAgent', args: List[str]):
+        """/preset [name]"""
+        if not args:
+            self._show_available_presets()
+        else:
+            self._apply_preset(agent, args[0])
+    
+    def _cmd_export(self, agent: 'UnifiedOpenAIAgent', args: List[str]):
+        """/export <format>"""
+        if not args:
+            print(f"{self.colors.error('Usage: /export <json|txt|md|html|csv|xml>')}")
+            return
         
-        return False
+        self._export_conversation(agent, args[0].lower())
     
-    def _show_chat_help(self, agent: UnifiedOpenAIAgent):
+    def _show_chat_help(self, agent: 'UnifiedOpenAIAgent'):
         """Show chat help"""
         model_config = ModelConfig.get_model_config(agent.model)
         
@@ -432,8 +459,9 @@ class UnifiedCLI:
             ("/quit", "Exit chat")
         ]
         
+        c = self.colors
         for cmd, desc in commands:
-            print(f"  {self.colors.highlight(cmd.ljust(15))} {self.colors.dim(desc)}")
+            print(f"  {c.cyan_code}{cmd.ljust(15)}{c.reset_code} {c.dim_code}{desc}{c.reset_code}")
         
         print(f"\n{self.colors.highlight('🧠 Model Information:')}")
         print(f"  {self.colors.bold('Current:')} {model_config['name']} ({agent.model})")
@@ -446,7 +474,7 @@ class UnifiedCLI:
         print(f"  {self.colors.dim('Supported: Programming files, config files, documentation')}")
         print()
     
-    def _show_recent_history(self, agent: UnifiedOpenAIAgent, limit: int):
+    def _show_recent_history(self, agent: 'UnifiedOpenAIAgent', limit: int):
         """Show recent conversation history"""
         recent_messages = agent.messages[-limit:]
         if not recent_messages:
@@ -454,37 +482,41 @@ class UnifiedCLI:
             return
         
         print(f"\n{self.colors.highlight(f'📜 Last {len(recent_messages)} messages:')}")
+        c = self.colors
         for msg in recent_messages:
-            timestamp = datetime.fromisoformat(msg["timestamp"]).strftime("%H:%M:%S")
-            role_color = 'CYAN' if msg["role"] == "user" else 'MAGENTA'
-            role_icon = "👤" if msg["role"] == "user" else "🤖"
+            timestamp = format_timestamp(msg["timestamp"])
+            role = msg["role"]
+            role_code = c.cyan_code if role == "user" else c.magenta_code
+            role_icon = "👤" if role == "user" else "🤖"
             
             content_preview = msg["content"][:80].replace('\n', ' ')
             if len(msg["content"]) > 80:
                 content_preview += "..."
             
-            print(f"  {self.colors.dim(f'[{timestamp}]')} {self.colors.format_text(role_color, role_icon + ' ' + msg['role'])}: {content_preview}")
+            print(f"  {c.dim_code}[{timestamp}]{c.reset_code} {role_code}{role_icon} {role}{c.reset_code}: {content_preview}")
         print()
     
-    def _search_conversation(self, agent: UnifiedOpenAIAgent, search_term: str):
+    def _search_conversation(self, agent: 'UnifiedOpenAIAgent', search_term: str):
         """Search conversation history"""
-        results = agent.search_history(search_term)
+        results = agent.search_history_fts(search_term)
         
         if not results:
             print(f"{self.colors.warning(f'No matches found for \"{search_term}\"')}")
             return
         
         print(f"\n{self.colors.highlight(f'🔍 Found {len(results)} matches for \"{search_term}\":')}")
+        c = self.colors
         for result in results:
             msg = result["message"]
-            timestamp = datetime.fromisoformat(msg["timestamp"]).strftime("%H:%M:%S")
-            role_color = 'CYAN' if msg["role"] == "user" else 'MAGENTA'
-            role_icon = "👤" if msg["role"] == "user" else "🤖"
+            timestamp = format_timestamp(msg["timestamp"])
+            role = msg["role"]
+            role_code = c.cyan_code if role == "user" else c.magenta_code
+            role_icon = "👤" if role == "user" else "🤖"
             
-            print(f"  {self.colors.dim(f'[{timestamp}]')} {self.colors.format_text(role_color, role_icon + ' ' + msg['role'])}: {result['preview']}")
+            print(f"  {c.dim_code}[{timestamp}]{c.reset_code} {role_code}{role_icon} {role}{c.reset_code}: {result['preview']}")
         print()
     
-    def _show_conversation_stats(self, agent: UnifiedOpenAIAgent):
+    def _show_conversation_stats(self, agent: 'UnifiedOpenAIAgent'):
         """Show conversation statistics"""
         stats = agent.get_statistics()
         model_display = agent.get_model_display_name()
@@ -503,11 +535,12 @@ class UnifiedCLI:
             print(f"  {self.colors.bold('Duration:')} {stats['conversation_duration']}")
         print()
     
-    def _show_current_config(self, agent: UnifiedOpenAIAgent):
+    def _show_current_config(self, agent: 'UnifiedOpenAIAgent'):
         """Show current configuration"""
         print(f"\n{self.colors.highlight('⚙️  Current Configuration:')}")
         
-        config_dict = agent.config.__dict__
+        from dataclasses import asdict
+        config_dict = asdict(agent.config)
         for key, value in config_dict.items():
             if key not in ['created_at', 'updated_at']:
                 if key == 'model':
@@ -524,12 +557,11 @@ class UnifiedCLI:
     def _show_available_presets(self):
         """Show available configuration presets"""
         print(f"\n{self.colors.highlight('🎯 Available Presets:')}")
-        for preset in ConfigManager.get_preset_names():
-            description = ConfigManager.describe_preset(preset)
+        for preset, description in ConfigManager.get_preset_descriptions():
             print(f"  {self.colors.highlight(preset.ljust(10))} {self.colors.dim(description)}")
         print(f"\n{self.colors.dim('Usage: /preset <name>')}")
     
-    def _apply_preset(self, agent: UnifiedOpenAIAgent, preset_name: str):
+    def _apply_preset(self, agent: 'UnifiedOpenAIAgent', preset_name: str):
         """Apply configuration preset"""
         try:
             new_config = ConfigManager.create_config_from_preset(agent.model, preset_name)
@@ -539,7 +571,7 @@ class UnifiedCLI:
         except ValueError as e:
             print(f"{self.colors.error(str(e))}")
     
-    def _export_conversation(self, agent: UnifiedOpenAIAgent, format_type: str):
+    def _export_conversation(self, agent: 'UnifiedOpenAIAgent', format_type: str):
         """Export conversation"""
         try:
             filepath = agent.export_conversation(format_type)
@@ -547,7 +579,7 @@ class UnifiedCLI:
         except Exception as e:
             print(f"{self.colors.error(f'Export failed: {e}')}")
     
-    def _clear_conversation_history(self, agent: UnifiedOpenAIAgent):
+    def _clear_conversation_history(self, agent: 'UnifiedOpenAIAgent'):
         """Clear conversation history with confirmation"""
         response = input(f"{self.colors.warning('Clear conversation history? (y/N): ')}").strip().lower()
         if response in ['y', 'yes']:
@@ -556,7 +588,7 @@ class UnifiedCLI:
         else:
             print(f"{self.colors.dim('Operation cancelled')}")
     
-    def _show_available_files(self, agent: UnifiedOpenAIAgent):
+    def _show_available_files(self, agent: 'UnifiedOpenAIAgent'):
         """Show available files for inclusion"""
         files = agent.list_files()
         if not files:
@@ -572,7 +604,7 @@ class UnifiedCLI:
         
         print(f"\n{self.colors.dim('💡 Use {{filename}} in your message to include file contents')}")
     
-    def _show_current_model_info(self, agent: UnifiedOpenAIAgent):
+    def _show_current_model_info(self, agent: 'UnifiedOpenAIAgent'):
         """Show current model information"""
         model_config = ModelConfig.get_model_config(agent.model)
         
@@ -580,57 +612,277 @@ class UnifiedCLI:
         self.ui.print_model_info(agent.model, model_config)
         print()
     
+    def _list_agent_files(self, agent_dir: Path, limit: int = 50) -> Tuple[List[tuple], int]:
+        """Walk an agent directory with scandir, returning the first sorted (path parts, size) pairs and the file count"""
+        files = []
+        stack = [(str(agent_dir), ())]
+        
+        while stack:
+            path, parts = stack.pop()
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, parts + (entry.name,)))
+                    elif entry.is_file():
+                        files.append((parts + (entry.name,), entry))
+        
+        # Only the displayed window is sorted and stat'ed
+        import heapq
+        shown = heapq.nsmallest(limit, files, key=lambda item: item[0])
+        return [(parts, entry.stat().st_size) for parts, entry in shown], len(files)
+    
+    def _stat_history_file(self, agent_dir: Path) -> Optional[Tuple[Path, os.stat_result]]:
+        """Find and stat an agent's history file (legacy history.json as fallback) in one call each"""
+        for name in ("history.jsonl", "history.json"):
+            history_file = agent_dir / name
+            try:
+                return history_file, os.stat(history_file)
+            except FileNotFoundError:
+                continue
+        return None
+    
     def _get_all_agents(self) -> List[Dict[str, Any]]:
         """Get information about all available agents"""
         agents_dir = Path("agents")
         agents = []
         
-        if not agents_dir.exists():
+        try:
+            entries = list(os.scandir(agents_dir))
+        except FileNotFoundError:
             return agents
         
-        for agent_dir in agents_dir.iterdir():
-            if agent_dir.is_dir():
+        for entry in entries:
+            if entry.is_dir():
+                agent_dir = agents_dir / entry.name
                 agent_info = {
-                    "id": agent_dir.name,
+                    "id": entry.name,
                     "path": str(agent_dir),
                     "exists": True
                 }
                 
-                # Get config info
-                config_file = agent_dir / "config.yaml"
-                if config_file.exists():
-                    try:
-                        with open(config_file) as f:
-                            config = yaml.safe_load(f)
-                            agent_info["model"] = config.get("model", "unknown")
-                            agent_info["created_at"] = config.get("created_at")
-                            agent_info["updated_at"] = config.get("updated_at")
-                    except:
-                        pass
+                # Get config info (load_config_file stats the file, so a missing one just raises)
+                try:
+                    config = load_config_file(agent_dir / "config.yaml", use_sidecar=True)
+                    agent_info["model"] = config.get("model", "unknown")
+                    agent_info["created_at"] = config.get("created_at")
+                    agent_info["updated_at"] = config.get("updated_at")
+                except:
+                    pass
                 
-                # Get history info
-                history_file = agent_dir / "history.json"
-                if history_file.exists():
+                # Get history info with one stat of the history file
+                agent_info["message_count"] = 0
+                agent_info["history_size"] = 0
+                found = self._stat_history_file(agent_dir)
+                if found:
+                    history_file, history_stat = found
                     try:
-                        with open(history_file) as f:
-                            history = json.load(f)
-                            agent_info["message_count"] = len(history)
-                            agent_info["history_size"] = history_file.stat().st_size
+                        agent_info["message_count"] = load_history_meta(history_file, history_stat)["count"]
+                        agent_info["history_size"] = history_stat.st_size
                     except:
-                        agent_info["message_count"] = 0
-                        agent_info["history_size"] = 0
-                else:
-                    agent_info["message_count"] = 0
-                    agent_info["history_size"] = 0
+                        pass
                 
                 agents.append(agent_info)
         
         return sorted(agents, key=lambda x: x.get("updated_at", ""))
     
+    def _fast_dispatch(self, argv: List[str]) -> bool:
+        """Run a lone information, help or show-config command without parsing arguments through argparse"""
+        args = []
+        for arg in argv:
+            if arg.startswith("--") and "=" in arg:
+                args.extend(arg.split("=", 1))
+            elif arg != "--no-color":
+                args.append(arg)
+        no_color = "--no-color" in argv
+        
+        if len(args) == 1 and args[0] in ("--list", "--models", "--version", "-h", "--help"):
+            command, value = args[0], None
+        elif len(args) == 2 and args[0] in ("--info", "--stats") and args[1] and not args[1].startswith("-"):
+            command, value = args
+        elif len(args) == 3 and "--show-config" in (args[0], args[2]) and "--agent-id" in (args[0], args[1]):
+            command, value = "--show-config", args[args.index("--agent-id") + 1]
+            if value.startswith("-") or not self.validator.validate_agent_id(value):
+                return False
+        else:
+            return False
+        
+        if no_color:
+            self.colors.colors_available = False
+            self.colors._setup_colors()
+        
+        if command == "--list":
+            self.list_agents()
+        elif command == "--models":
+            self.show_models()
+        elif command == "--version":
+            print(f"Unified OpenAI Agent System {self.version}")
+        elif command in ("-h", "--help"):
+            self.create_argument_parser().print_help()
+        elif command == "--show-config":
+            try:
+                from agent import UnifiedOpenAIAgent
+                self._show_current_config(UnifiedOpenAIAgent(value, self.DEFAULT_MODEL))
+            except Exception as e:
+                print(f"{self.colors.error(f'Error: {e}')}")
+                sys.exit(1)
+        else:
+            self.show_agent_info(value)  # Stats are shown in info
+        return True
+    
+    def _build_agent_commands(self) -> List[Tuple[str, Any]]:
+        """(argument, handler(agent, args)) pairs for the one-shot agent commands, in priority order"""
+        return [
+            ("config", self._run_config),
+            ("preset", self._run_preset),
+            ("show_config", lambda agent, args: self._show_current_config(agent)),
+            ("export", self._run_export),
+            ("export_all", self._run_export_all),
+            ("clear", self._run_clear),
+            ("backup", self._run_backup),
+            ("search", self._run_search),
+        ]
+    
+    def _run_config(self, agent: 'UnifiedOpenAIAgent', args: argparse.Namespace):
+        """--config: configure the agent interactively"""
+        agent.config = ConfigManager.create_interactive_config(args.model)
+        agent._save_config()
+        print(f"{self.colors.success('Configuration saved')}")
+    
+    def _run_preset(self, agent: 'UnifiedOpenAIAgent', args: argparse.Namespace):
+        """--preset: apply a configuration preset"""
+        try:
+            new_config = ConfigManager.create_config_from_preset(args.model, args.preset)
+        except ValueError as e:
+            print(f"{self.colors.error(str(e))}")
+            return
+        agent.config = new_config
+        agent._save_config()
+        print(f"{self.colors.success(f'Applied preset: {args.preset}')}")
+    
+    def _run_export(self, agent: 'UnifiedOpenAIAgent', args: argparse.Namespace):
+        """--export: export the conversation in one format"""
+        filepath = agent.export_conversation(args.export)
+        print(f"{self.colors.success(f'Exported to: {filepath}')}")
+    
+    def _run_export_all(self, agent: 'UnifiedOpenAIAgent', args: argparse.Namespace):
+        """--export-all: export the conversation in every format"""
+        formats = ["json", "txt", "md", "html", "csv", "xml"]
+        exported_files = []
+        for fmt, result in agent.export_all(formats).items():
+            if isinstance(result, Exception):
+                print(f"{self.colors.error(f'Failed to export {fmt}: {result}')}")
+            else:
+                exported_files.append(result)
+        
+        if exported_files:
+            print(f"{self.colors.success(f'Exported {len(exported_files)} files:')}")
+            sys.stdout.write("".join(f"  {filepath}\n" for filepath in exported_files))
+    
+    def _run_clear(self, agent: 'UnifiedOpenAIAgent', args: argparse.Namespace):
+        """--clear: clear the conversation history after confirmation"""
+        if args.yes:
+            response = 'y'
+        else:
+            try:
+                response = input(f"{self.colors.warning('Clear conversation history? (y/N): ')}").strip().lower()
+            except EOFError:
+                # Scripted run with nothing on stdin: keep the history
+                response = 'n'
+        if response in ['y', 'yes']:
+            agent.clear_history()
+            print(f"{self.colors.success('Conversation history cleared')}")
+    
+    def _run_backup(self, agent: 'UnifiedOpenAIAgent', args: argparse.Namespace):
+        """--backup: back up the history file"""
+        agent.flush_history()
+        agent._create_backup()
+        print(f"{self.colors.success('Backup created')}")
+    
+    def _run_search(self, agent: 'UnifiedOpenAIAgent', args: argparse.Namespace):
+        """--search: search the conversation history"""
+        results = agent.search_history(args.search, archived=args.archived)
+        if results:
+            print(f"\n{self.colors.highlight(f'Found {len(results)} matches:')}")
+            # One write for all result rows
+            rows = []
+            for result in results:
+                msg = result["message"]
+                rows.append(f"  [{format_timestamp(msg['timestamp'])}] {msg['role']}: {result['preview']}\n")
+            sys.stdout.write("".join(rows))
+        else:
+            print(f"{self.colors.warning(f'No matches found for \"{args.search}\"')}")
+    
+    # (argument, config field, value for the field, or None when the argument was not given)
+    _CONFIG_OVERRIDES = (
+        ("effort", "reasoning_effort", lambda value: value or None),
+        ("temperature", "temperature", lambda value: value),
+        ("max_tokens", "max_output_tokens", lambda value: value or None),
+        ("no_stream", "stream", lambda value: False if value else None),
+        ("system_prompt", "system_prompt", lambda value: value or None),
+    )
+    
+    def _apply_overrides(self, agent: 'UnifiedOpenAIAgent', args: argparse.Namespace) -> bool:
+        """Apply command line parameter overrides to the agent config, False if one is invalid"""
+        if args.temperature is not None and not self.validator.validate_temperature(args.temperature):
+            print(f"{self.colors.error('Temperature must be between 0.0 and 2.0')}")
+            return False
+        
+        changed = False
+        for arg, field, to_value in self._CONFIG_OVERRIDES:
+            value = to_value(getattr(args, arg))
+            if value is not None and getattr(agent.config, field) != value:
+                setattr(agent.config, field, value)
+                changed = True
+        
+        # The config is only rewritten when an override changed a field
+        if changed:
+            agent._save_config()
+        return True
+    
+    def _run_batch(self, agent: 'UnifiedOpenAIAgent', args: argparse.Namespace):
+        """--batch: send each line of a file to the model"""
+        # Open directly rather than checking for the file first
+        try:
+            batch = open(args.batch, 'rb', buffering=1 << 20)
+        except FileNotFoundError:
+            print(f"{self.colors.error(f'Batch file not found: {args.batch}')}")
+            return
+        except OSError as e:
+            print(f"{self.colors.error(f'Error processing batch file: {e}')}")
+            return
+        
+        try:
+            # Each command's request carries the previous answers, so commands cannot be
+            # prefetched; overlap the HTTP stack import with reading the first one instead
+            agent.prewarm()
+            c = self.colors
+            
+            # Stream the file so the first command starts before the rest is read;
+            # only the lines that are sent get decoded
+            with batch:
+                for i, line in enumerate(batch, 1):
+                    command = line.strip()
+                    if command and not command.startswith(b'#'):
+                        command = command.decode('utf-8')
+                        print(f"{c.dim_code}[{i}] Processing:{c.reset_code} {command}")
+                        # Process batch command (simplified for now); nobody types between
+                        # batch responses, so writes go out per 4 KiB or per flush interval
+                        with StreamPrinter(max_chars=4096) as out:
+                            for chunk in agent.call_api(command):
+                                out.write(chunk)
+                        print("\n")
+        except Exception as e:
+            print(f"{self.colors.error(f'Error processing batch file: {e}')}")
+    
     def run(self):
         """Main entry point"""
-        parser = self.create_argument_parser()
-        args = parser.parse_args()
+        argv = sys.argv[1:]
+        if self._fast_dispatch(argv):
+            return
+        
+        # The colorized examples are only built when help will be printed
+        parser = self.create_argument_parser(epilog="-h" in argv or "--help" in argv)
+        args = parser.parse_args(argv)
         
         # Handle no-color flag
         if args.no_color:
@@ -658,6 +910,7 @@ class UnifiedCLI:
         if not args.agent_id:
             if not any([args.list, args.models, args.info, args.stats]):
                 self.ui.print_banner("Unified OpenAI Agent System", f"Version {self.version}")
+                parser.epilog = self._epilog()
                 parser.print_help()
                 print(f"\n{self.colors.error('Error: --agent-id is required for chat operations')}")
                 print(f"{self.colors.dim('Use --list to see available agents or --models to see available models')}")
@@ -670,122 +923,20 @@ class UnifiedCLI:
         
         try:
             # Initialize agent
+            from agent import UnifiedOpenAIAgent
             agent = UnifiedOpenAIAgent(args.agent_id, args.model)
             
-            # Handle configuration commands
-            if args.config:
-                new_config = ConfigManager.create_interactive_config(args.model)
-                agent.config = new_config
-                agent._save_config()
-                print(f"{self.colors.success('Configuration saved')}")
-                return
-            
-            if args.preset:
-                try:
-                    new_config = ConfigManager.create_config_from_preset(args.model, args.preset)
-                    agent.config = new_config
-                    agent._save_config()
-                    print(f"{self.colors.success(f'Applied preset: {args.preset}')}")
+            # One-shot commands, checked in priority order; the first one given runs
+            for flag, handler in self._agent_commands:
+                if getattr(args, flag):
+                    handler(agent, args)
                     return
-                except ValueError as e:
-                    print(f"{self.colors.error(str(e))}")
-                    return
-            
-            if args.show_config:
-                self._show_current_config(agent)
-                return
-            
-            # Handle export commands
-            if args.export:
-                filepath = agent.export_conversation(args.export)
-                print(f"{self.colors.success(f'Exported to: {filepath}')}")
-                return
-            
-            if args.export_all:
-                formats = ["json", "txt", "md", "html", "csv", "xml"]
-                exported_files = []
-                for fmt in formats:
-                    try:
-                        filepath = agent.export_conversation(fmt)
-                        exported_files.append(filepath)
-                    except Exception as e:
-                        print(f"{self.colors.error(f'Failed to export {fmt}: {e}')}")
-                
-                if exported_files:
-                    print(f"{self.colors.success(f'Exported {len(exported_files)} files:')}")
-                    for filepath in exported_files:
-                        print(f"  {filepath}")
-                return
-            
-            # Handle conversation management
-            if args.clear:
-                response = input(f"{self.colors.warning('Clear conversation history? (y/N): ')}").strip().lower()
-                if response in ['y', 'yes']:
-                    agent.clear_history()
-                    print(f"{self.colors.success('Conversation history cleared')}")
-                return
             
-            if args.backup:
-                agent._create_backup()
-                print(f"{self.colors.success('Backup created')}")
+            if not self._apply_overrides(agent, args):
                 return
             
-            if args.search:
-                results = agent.search_history(args.search)
-                if results:
-                    print(f"\n{self.colors.highlight(f'Found {len(results)} matches:')}")
-                    for result in results:
-                        msg = result["message"]
-                        timestamp = datetime.fromisoformat(msg["timestamp"]).strftime("%H:%M:%S")
-                        print(f"  [{timestamp}] {msg['role']}: {result['preview']}")
-                else:
-                    print(f"{self.colors.warning(f'No matches found for \"{args.search}\"')}")
-                return
-            
-            # Apply command line overrides
-            overrides = {}
-            if args.effort:
-                overrides["reasoning_effort"] = args.effort
-            if args.temperature is not None:
-                if self.validator.validate_temperature(args.temperature):
-                    overrides["temperature"] = args.temperature
-                else:
-                    print(f"{self.colors.error('Temperature must be between 0.0 and 2.0')}")
-                    return
-            if args.max_tokens:
-                overrides["max_output_tokens"] = args.max_tokens
-            if args.no_stream:
-                overrides["stream"] = False
-            if args.system_prompt:
-                overrides["system_prompt"] = args.system_prompt
-            
-            # Apply overrides
-            if overrides:
-                for key, value in overrides.items():
-                    setattr(agent.config, key, value)
-                agent._save_config()
-            
-            # Handle batch mode
             if args.batch:
-                batch_file = Path(args.batch)
-                if not batch_file.exists():
-                    print(f"{self.colors.error(f'Batch file not found: {args.batch}')}")
-                    return
-                
-                try:
-                    with open(batch_file, 'r') as f:
-                        commands = f.readlines()
-                    
-                    for i, command in enumerate(commands, 1):
-                        command = command.strip()
-                        if command and not command.startswith('#'):
-                            print(f"{self.colors.dim(f'[{i}] Processing:')} {command}")
-                            # Process batch command (simplified for now)
-                            for chunk in agent.call_api(command):
-                                print(chunk, end="", flush=True)
-                            print("\n")
-                except Exception as e:
-                    print(f"{self.colors.error(f'Error processing batch file: {e}')}")
+                self._run_batch(agent, args)
                 return
             
             # Start interactive chat
@@ -8,16 +8,43 @@ including color management, file handling, security, and UI enhancements.
 
 import os
 import sys
+import codecs
 import json
+import logging
 import re
+import time
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from stat import S_ISREG
+from typing import List, Optional, Dict, Any, Union, Iterable, Iterator, Tuple
 from datetime import datetime
+from functools import lru_cache
+
+# config only imports utils lazily, so this is not circular
+from config import ModelConfig
+
+try:
+    import orjson
+except ImportError:
+    # Optional dependency - fall back to the standard json module
+    orjson = None
 
 
 class ColorManager:
     """Enhanced color management with fallback support"""
     
+    # Plain-text formatters installed on the instance when colors are unavailable,
+    # so monochrome output skips the empty escape codes entirely
+    _PLAIN_FORMATTERS = {
+        'format_text': lambda color, text='': text,
+        'success': lambda text: f"✅ {text}",
+        'error': lambda text: f"❌ {text}",
+        'warning': lambda text: f"⚠️  {text}",
+        'info': lambda text: f"ℹ️  {text}",
+        'highlight': lambda text: text,
+        'bold': lambda text: text,
+        'dim': lambda text: text,
+    }
+    
     def __init__(self):
         self.colors_available = self._check_color_support()
         self._setup_colors()
@@ -91,47 +118,64 @@ class ColorManager:
                 'BRIGHT', 'DIM', 'RESET', 'BG_BLACK', 'BG_RED', 'BG_GREEN',
                 'BG_YELLOW', 'BG_BLUE', 'BG_MAGENTA', 'BG_CYAN', 'BG_WHITE'
             ]}
+            
+        # Raw codes as attributes (reset_code, green_code, bg_red_code, ...) for hot
+        # paths that inline them into f-strings ('' without color)
+        for name, code in self.colors.items():
+            setattr(self, f"{name.lower()}_code", code)
+        
+        if self.colors_available:
+            for name in self._PLAIN_FORMATTERS:
+                self.__dict__.pop(name, None)
+        else:
+            self.__dict__.update(self._PLAIN_FORMATTERS)
     
     def format_text(self, color: str, text: str = '') -> str:
         """Format text with color"""
+        code = self.colors.get(color, '')
         if text:
-            return f"{self.colors.get(color, '')}{text}{self.colors.get('RESET', '')}"
-        return self.colors.get(color, '')
+            return f"{code}{text}{self.reset_code}"
+        return code
     
     def success(self, text: str) -> str:
         """Format success message"""
-        return self.format_text('GREEN', f"✅ {text}")
+        return f"{self.green_code}✅ {text}{self.reset_code}"
     
     def error(self, text: str) -> str:
         """Format error message"""
-        return self.format_text('RED', f"❌ {text}")
+        return f"{self.red_code}❌ {text}{self.reset_code}"
     
     def warning(self, text: str) -> str:
         """Format warning message"""
-        return self.format_text('YELLOW', f"⚠️  {text}")
+        return f"{self.yellow_code}⚠️  {text}{self.reset_code}"
     
     def info(self, text: str) -> str:
         """Format info message"""
-        return self.format_text('BLUE', f"ℹ️  {text}")
+        return f"{self.blue_code}ℹ️  {text}{self.reset_code}"
     
     def highlight(self, text: str) -> str:
         """Highlight text"""
-        return self.format_text('CYAN', text)
+        if text:
+            return f"{self.cyan_code}{text}{self.reset_code}"
+        return self.cyan_code
     
     def bold(self, text: str) -> str:
         """Bold text"""
-        return f"{self.colors.get('BRIGHT', '')}{text}{self.colors.get('RESET', '')}"
+        return f"{self.bright_code}{text}{self.reset_code}"
     
     def dim(self, text: str) -> str:
         """Dim text"""
-        return f"{self.colors.get('DIM', '')}{text}{self.colors.get('RESET', '')}"
+        return f"{self.dim_code}{text}{self.reset_code}"
 
 
 class FileHandler:
     """Advanced file handling with security and validation"""
     
+    # {filename} inclusion pattern
+    FILE_INCLUSION_PATTERN = re.compile(r'\{([^}]+)\}')
+    
     # Enhanced file extensions support
-    SUPPORTED_EXTENSIONS = {
+    SUPPORTED_EXTENSIONS = frozenset({
         # Programming languages
         '.py', '.r', '.js', '.ts', '.jsx', '.tsx', '.java', '.c', '.cpp', '.cc', '.cxx',
         '.h', '.hpp', '.cs', '.php', '.rb', '.go', '.rs', '.swift', '.kt', '.scala',
@@ -164,71 +208,145 @@ class FileHandler:
         '.editorconfig', '.gitignore', '.gitattributes', '.dockerignore', '.eslintrc',
         '.prettierrc', '.babelrc', '.webpack', '.rollup', '.vite', '.parcel',
         '.browserslistrc', '.nvmrc', '.npmrc', '.yarnrc'
-    }
+    })
     
-    KNOWN_FILENAMES = {
+    KNOWN_FILENAMES = frozenset({
         'makefile', 'dockerfile', 'rakefile', 'gemfile', 'podfile',
         'readme', 'license', 'changelog', 'authors', 'contributors',
         'todo', 'manifest', 'requirements', 'pipfile', 'poetry',
         'cmakelists.txt', 'configure', 'install', 'news', 'copying'
+    })
+    
+    # Directories searched for {filename} inclusions, in priority order (plus the
+    # agent's uploads directory)
+    SEARCH_DIRS = (
+        '.', 'src', 'lib', 'scripts', 'data', 'documents', 'files',
+        'config', 'configs', 'examples', 'samples', 'templates'
+    )
+    
+    # Language-specific comment styles, flattened to one template per extension
+    DEFAULT_HEADER_TEMPLATE = "# File: {f} ({e})\n"
+    HEADER_TEMPLATES = {
+        extension: template
+        for extensions, template in (
+            (('.py', '.r', '.sh', '.bash', '.zsh', '.fish', '.yml', '.yaml', '.toml'), "# File: {f} ({e})\n"),
+            (('.js', '.ts', '.jsx', '.tsx', '.java', '.c', '.cpp', '.cc', '.cxx', '.h', '.hpp', '.cs', '.go', '.rs', '.swift', '.kt', '.scala'), "// File: {f} ({e})\n"),
+            (('.html', '.htm', '.xml', '.xsl', '.xslt', '.svg'), "<!-- File: {f} ({e}) -->\n"),
+            (('.css', '.scss', '.sass', '.less'), "/* File: {f} ({e}) */\n"),
+            (('.sql',), "-- File: {f} ({e})\n"),
+            (('.php',), "<?php\n// File: {f} ({e})\n"),
+            (('.rb',), "# File: {f} ({e})\n"),
+            (('.hs',), "-- File: {f} ({e})\n"),
+            (('.ml', '.fs'), "(* File: {f} ({e}) *)\n"),
+            (('.clj',), ";; File: {f} ({e})\n")
+        )
+        for extension in extensions
     }
     
+    # list_files stats candidates on a thread pool above this many files
+    PARALLEL_STAT_THRESHOLD = 64
+    
     def __init__(self):
         self.max_file_size = 2 * 1024 * 1024  # 2MB default
         self.encoding_fallbacks = ['utf-8', 'utf-16', 'latin-1', 'cp1252']
     
-    def is_supported_file(self, file_path: Path) -> bool:
+    def is_supported_file(self, file_path: Path, extension: Optional[str] = None) -> bool:
         """Check if file is supported for inclusion"""
-        if file_path.suffix.lower() in self.SUPPORTED_EXTENSIONS:
-            return True
-        
-        return file_path.name.lower() in self.KNOWN_FILENAMES
+        if extension is None:
+            extension = file_path.suffix.lower()
+        return self._is_supported_name(file_path.name, extension)
+    
+    @classmethod
+    def _is_supported_name(cls, name: str, extension: str) -> bool:
+        """Support check on plain strings (extension already lowercased)"""
+        # Two frozenset lookups; an lru_cache in front measured slower than this
+        return extension in cls.SUPPORTED_EXTENSIONS or name.lower() in cls.KNOWN_FILENAMES
     
-    def read_file_safely(self, file_path: Path) -> Optional[str]:
+    def read_file_safely(self, file_path: Path, size: Optional[int] = None) -> Optional[str]:
         """Safely read file with encoding detection and size limits"""
         try:
-            # Check file size
-            if file_path.stat().st_size > self.max_file_size:
+            # Check file size, unless the caller already stat'ed the file
+            if size is None:
+                size = file_path.stat().st_size
+            if size > self.max_file_size:
                 return None
             
-            # Try different encodings
-            for encoding in self.encoding_fallbacks:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        content = f.read()
-                    return content
-                except UnicodeDecodeError:
-                    continue
+            # Read once; only the decoding is retried
+            with open(file_path, 'rb') as f:
+                data = f.read()
             
-            return None
+            content = self._decode_text(data)
+            if content is None or '\r' not in content:
+                return content
+            
+            # Match the newline translation of the text-mode reads this replaced
+            return content.replace('\r\n', '\n').replace('\r', '\n')
         except Exception:
             return None
     
+    def _decode_text(self, data: bytes) -> Optional[str]:
+        """Decode with the first fallback, else the detected encoding, else the rest"""
+        first, *encodings = self.encoding_fallbacks
+        try:
+            return data.decode(first)
+        except UnicodeDecodeError:
+            pass
+        
+        detected = self._detect_encoding(data)
+        if detected:
+            encodings.insert(0, detected)
+        
+        for encoding in encodings:
+            try:
+                return data.decode(encoding)
+            except (UnicodeDecodeError, LookupError):
+                continue
+        
+        return None
+    
+    def _detect_encoding(self, data: bytes) -> Optional[str]:
+        """Guess the encoding of non-UTF-8 bytes with charset_normalizer, if available"""
+        try:
+            # Installed alongside requests; imported only when UTF-8 decoding fails
+            from charset_normalizer import from_bytes
+        except ImportError:
+            return None
+        
+        results = from_bytes(data)
+        best = results.best()
+        if best is None:
+            return None
+        
+        # Short texts often tie (e.g. cp1250 vs cp1252 for French); break ties
+        # toward the configured fallbacks
+        preferred = {codecs.lookup(encoding).name for encoding in self.encoding_fallbacks}
+        for match in results:
+            if (
+                match.chaos == best.chaos and match.coherence == best.coherence and
+                codecs.lookup(match.encoding).name in preferred
+            ):
+                return match.encoding
+        return best.encoding
+    
     def process_file_inclusions(self, content: str, base_dir: Path, logger) -> str:
         """Process {filename} patterns with enhanced file inclusion"""
+        if "{" not in content:
+            return content
+            
+        # Search paths with priority, checked once per message rather than per match
+        search_paths = self._search_paths(base_dir)
+        
         def replace_file(match):
             filename = match.group(1)
             
-            # Search paths with priority
-            search_paths = [
-                Path('.'),
-                Path('src'),
-                Path('lib'),
-                Path('scripts'),
-                Path('data'),
-                Path('documents'),
-                Path('files'),
-                Path('config'),
-                Path('configs'),
-                Path('examples'),
-                Path('samples'),
-                Path('templates'),
-                base_dir / 'uploads'
-            ]
-            
             for search_path in search_paths:
                 file_path = search_path / filename
-                if file_path.exists() and file_path.is_file():
+                try:
+                    # One stat answers both "is it a file" and the size checks below
+                    file_stat = file_path.stat()
+                except (OSError, ValueError):
+                    continue
+                if S_ISREG(file_stat.st_mode):
                     
                     # Security check - prevent path traversal
                     try:
@@ -237,23 +355,23 @@ class FileHandler:
                         logger.warning(f"Security: Path traversal attempt blocked for {filename}")
                         return f"[SECURITY: Access denied for {filename}]"
                     
-                    # Check if file is supported
-                    if not self.is_supported_file(file_path):
+                    # Check if file is supported; the lowered suffix is shared with the header
+                    extension = file_path.suffix.lower()
+                    if not self.is_supported_file(file_path, extension):
                         logger.warning(f"Unsupported file type: {filename}")
                         return f"[WARNING: Unsupported file type {filename}]"
                     
                     # Read file safely
-                    file_content = self.read_file_safely(file_path)
+                    if file_stat.st_size > self.max_file_size:
+                        logger.error(f"File {filename} too large (max {self.max_file_size//1024//1024}MB)")
+                        return f"[ERROR: File {filename} too large (max {self.max_file_size//1024//1024}MB)]"
+                    file_content = self.read_file_safely(file_path, file_stat.st_size)
                     if file_content is None:
-                        if file_path.stat().st_size > self.max_file_size:
-                            logger.error(f"File {filename} too large (max {self.max_file_size//1024//1024}MB)")
-                            return f"[ERROR: File {filename} too large (max {self.max_file_size//1024//1024}MB)]"
-                        else:
-                            logger.error(f"Could not read file {filename}")
-                            return f"[ERROR: Could not read {filename}]"
+                        logger.error(f"Could not read file {filename}")
+                        return f"[ERROR: Could not read {filename}]"
                     
                     # Add enhanced file info header
-                    file_info = self._generate_file_header(filename, file_path)
+                    file_info = self._generate_file_header(filename, extension)
                     full_content = file_info + file_content
                     
                     logger.info(f"Included file: {filename} ({len(file_content)} chars, {file_path.suffix})")
@@ -262,82 +380,123 @@ class FileHandler:
             logger.warning(f"File not found: {filename}")
             return f"[ERROR: File {filename} not found]"
         
-        return re.sub(r'\{([^}]+)\}', replace_file, content)
+        return self.FILE_INCLUSION_PATTERN.sub(replace_file, content)
     
-    def _generate_file_header(self, filename: str, file_path: Path) -> str:
+    def _generate_file_header(self, filename: str, extension: str) -> str:
         """Generate appropriate file header based on file type"""
-        extension = file_path.suffix.lower()
-        
-        # Language-specific comment styles
-        comment_styles = {
-            ('.py', '.r', '.sh', '.bash', '.zsh', '.fish', '.yml', '.yaml', '.toml'): lambda f, e: f"# File: {f} ({e})\n",
-            ('.js', '.ts', '.jsx', '.tsx', '.java', '.c', '.cpp', '.cc', '.cxx', '.h', '.hpp', '.cs', '.go', '.rs', '.swift', '.kt', '.scala'): lambda f, e: f"// File: {f} ({e})\n",
-            ('.html', '.htm', '.xml', '.xsl', '.xslt', '.svg'): lambda f, e: f"<!-- File: {f} ({e}) -->\n",
-            ('.css', '.scss', '.sass', '.less'): lambda f, e: f"/* File: {f} ({e}) */\n",
-            ('.sql',): lambda f, e: f"-- File: {f} ({e})\n",
-            ('.php',): lambda f, e: f"<?php\n// File: {f} ({e})\n",
-            ('.rb',): lambda f, e: f"# File: {f} ({e})\n",
-            ('.hs',): lambda f, e: f"-- File: {f} ({e})\n",
-            ('.ml', '.fs'): lambda f, e: f"(* File: {f} ({e}) *)\n",
-            ('.clj',): lambda f, e: f";; File: {f} ({e})\n"
-        }
-        
-        for extensions, comment_func in comment_styles.items():
-            if extension in extensions:
-                return comment_func(filename, extension)
-        
-        # Default comment style
-        return f"# File: {filename} ({extension})\n"
+        template = self.HEADER_TEMPLATES.get(extension, self.DEFAULT_HEADER_TEMPLATE)
+        return template.format(f=filename, e=extension)
+    
+    def _search_paths(self, base_dir: Path) -> List[Path]:
+        """Existing inclusion search directories in priority order, without duplicates"""
+        search_paths = []
+        seen = set()
+        for search_path in [Path(name) for name in self.SEARCH_DIRS] + [base_dir / 'uploads']:
+            if search_path.is_dir():
+                real_path = os.path.realpath(search_path)
+                if real_path not in seen:
+                    seen.add(real_path)
+                    search_paths.append(search_path)
+        return search_paths
+    
+    def _iter_supported_files(self, root: str):
+        """Yield (relative path, DirEntry, suffix) for supported files under root, like rglob('*')"""
+        stack = [(root, "")]
+        while stack:
+            path, rel_dir = stack.pop()
+            try:
+                with os.scandir(path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            for entry in entries:
+                name = entry.name
+                try:
+                    # Symlinked directories are not descended into, matching rglob
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, rel_dir + name + os.sep))
+                        continue
+                    
+                    # Hidden and unsupported names are dropped on the raw string,
+                    # before is_file() may need to stat (symlinks, DT_UNKNOWN)
+                    if name[0] == '.':
+                        continue
+                    dot = name.rfind('.')
+                    suffix = name[dot:] if 0 < dot < len(name) - 1 else ''
+                    if self._is_supported_name(name, suffix.lower()) and entry.is_file():
+                        yield rel_dir + name, entry, suffix
+                except OSError:
+                    continue
+    
+    @staticmethod
+    def _stat_entries(entries: List[os.DirEntry]) -> List[Optional[os.stat_result]]:
+        """Stat listed files (one call serves size and mtime), None where that fails"""
+        stats = []
+        for entry in entries:
+            try:
+                stats.append(entry.stat())
+            except OSError:
+                stats.append(None)
+        return stats
     
     def list_files(self, base_dir: Path) -> List[str]:
         """List available files for inclusion with enhanced information"""
         files = []
-        search_paths = [
-            Path('.'),
-            Path('src'),
-            Path('lib'),
-            Path('scripts'),
-            Path('data'),
-            Path('documents'),
-            Path('files'),
-            Path('config'),
-            Path('configs'),
-            Path('examples'),
-            Path('samples'),
-            Path('templates'),
-            base_dir / 'uploads'
-        ]
+        candidates = []
+        
+        # Search directories nested in one already walked (all of them, when '.'
+        # exists) would only list the same files again
+        walked = []
+        for search_path in self._search_paths(base_dir):
+            real_path = os.path.realpath(search_path)
+            if any(os.path.commonpath([real_path, parent]) == parent for parent in walked):
+                continue
+            walked.append(real_path)
+            
+            # Display paths keep the relative form rglob used to produce
+            root = str(search_path)
+            prefix = "" if root == "." else root + os.sep
+            for rel_path, entry, suffix in self._iter_supported_files(root):
+                candidates.append((prefix + rel_path, entry, suffix))
         
-        for search_path in search_paths:
-            if search_path.exists():
-                for file_path in search_path.rglob("*"):
-                    if (
-                        file_path.is_file() and
-                        not file_path.name.startswith('.') and
-                        self.is_supported_file(file_path)
-                    ):
-                        try:
-                            size = file_path.stat().st_size
-                            if size > self.max_file_size:
-                                size_str = f"{size/(1024*1024):.1f} MB (too large)"
-                                status = "❌"
-                            elif size < 1024:
-                                size_str = f"{size} bytes"
-                                status = "✅"
-                            elif size < 1024*1024:
-                                size_str = f"{size/1024:.1f} KB"
-                                status = "✅"
-                            else:
-                                size_str = f"{size/(1024*1024):.1f} MB"
-                                status = "✅"
-                            
-                            # Get modification time
-                            mtime = datetime.fromtimestamp(file_path.stat().st_mtime)
-                            time_str = mtime.strftime("%Y-%m-%d %H:%M")
-                            
-                            files.append(f"{status} {file_path} ({size_str}) [{file_path.suffix}] {time_str}")
-                        except Exception:
-                            files.append(f"❓ {file_path} (unknown size) [{file_path.suffix}]")
+        # Stats overlap across threads (each releases the GIL), which pays off on
+        # slow or network filesystems; short listings are not worth the pool
+        entries = [entry for _, entry, _ in candidates]
+        if len(entries) > self.PARALLEL_STAT_THRESHOLD:
+            # One contiguous slice per worker keeps the per-task overhead negligible
+            from concurrent.futures import ThreadPoolExecutor
+            workers = 8
+            step = -(-len(entries) // workers)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                slices = executor.map(self._stat_entries, (entries[i:i + step] for i in range(0, len(entries), step)))
+                stats = [file_stat for chunk in slices for file_stat in chunk]
+        else:
+            stats = self._stat_entries(entries)
+        
+        for (display_path, _, suffix), file_stat in zip(candidates, stats):
+            if file_stat is None:
+                files.append(f"❓ {display_path} (unknown size) [{suffix}]")
+                continue
+            
+            size = file_stat.st_size
+            if size > self.max_file_size:
+                size_str = f"{size/(1024*1024):.1f} MB (too large)"
+                status = "❌"
+            elif size < 1024:
+                size_str = f"{size} bytes"
+                status = "✅"
+            elif size < 1024*1024:
+                size_str = f"{size/1024:.1f} KB"
+                status = "✅"
+            else:
+                size_str = f"{size/(1024*1024):.1f} MB"
+                status = "✅"
+            
+            # Get modification time
+            mtime = datetime.fromtimestamp(file_stat.st_mtime)
+            time_str = mtime.strftime("%Y-%m-%d %H:%M")
+            
+            files.append(f"{status} {display_path} ({size_str}) [{suffix}] {time_str}")
         
         return sorted(files)
 
@@ -357,19 +516,17 @@ class SecurityManager:
         
         # Try secrets file
         secrets_file = base_dir / "secrets.json"
-        if secrets_file.exists():
-            try:
-                with open(secrets_file, 'r') as f:
-                    secrets = json.load(f)
-                    keys = secrets.get('keys', {})
-                    api_key = keys.get(model) or keys.get('default')
-                    if api_key:
-                        return api_key
-            except Exception:
-                pass
+        try:
+            # A missing file falls through to the prompt like a malformed one
+            secrets = json_loads(secrets_file.read_bytes())
+            keys = secrets.get('keys', {})
+            api_key = keys.get(model) or keys.get('default')
+            if api_key:
+                return api_key
+        except Exception:
+            pass
         
-        # Prompt user for API key with enhanced UX
-        from config import ModelConfig
+        # Prompt user for API key with enhanced UX (model configs are memoized)
         model_config = ModelConfig.get_model_config(model)
         model_display = model_config["name"]
         
@@ -457,10 +614,15 @@ class SecurityManager:
     def _update_gitignore(self):
         """Update .gitignore to exclude secrets"""
         gitignore_file = Path('.gitignore')
-        gitignore_content = ""
+        try:
+            raw_content = gitignore_file.read_bytes()
+        except FileNotFoundError:
+            raw_content = b""
         
-        if gitignore_file.exists():
-            gitignore_content = gitignore_file.read_text()
+        # The block below is appended in one go, so its header means it is already there
+        if b"# API Keys and Secrets" in raw_content:
+            return
+        gitignore_content = raw_content.decode('utf-8', errors='replace')
         
         # Add secrets patterns if not present
         patterns_to_add = [
@@ -471,10 +633,9 @@ class SecurityManager:
             "**/.env"
         ]
         
-        patterns_needed = []
-        for pattern in patterns_to_add:
-            if pattern not in gitignore_content:
-                patterns_needed.append(pattern)
+        # Whole-line matches, so "**/secrets.json" no longer counts as "secrets.json"
+        existing = {line.strip() for line in gitignore_content.splitlines()}
+        patterns_needed = [pattern for pattern in patterns_to_add if pattern not in existing]
         
         if patterns_needed:
             with open(gitignore_file, 'a', encoding='utf-8') as f:
@@ -488,7 +649,16 @@ class UIEnhancer:
     
     def __init__(self):
         self.colors = ColorManager()
+        self.refresh_terminal_width()
+        self._last_progress_line = None
+        # (headers, widths) -> (header row, separator); listings repeat the same layout
+        self._table_cache: Dict[Tuple[Tuple[str, ...], Tuple[int, ...]], Tuple[str, str]] = {}
+    
+    def refresh_terminal_width(self):
+        """Re-read the terminal width, e.g. after a resize"""
         self.terminal_width = self._get_terminal_width()
+        self._banner_width = min(self.terminal_width, 80)
+        self._banner_rule = '=' * self._banner_width
     
     def _get_terminal_width(self) -> int:
         """Get terminal width with fallback"""
@@ -499,27 +669,25 @@ class UIEnhancer:
     
     def print_banner(self, title: str, subtitle: str = ""):
         """Print an attractive banner"""
-        width = min(self.terminal_width, 80)
+        width = self._banner_width
+        rule = self.colors.format_text('CYAN', self._banner_rule)
+        edge = self.colors.format_text('CYAN', '=')
         
-        print()
-        print(self.colors.format_text('CYAN', '=' * width))
+        # Lines are collected and written at once
+        lines = ["", rule]
         
         # Center the title
         title_line = f"  🤖 {title}  "
         padding = (width - len(title_line)) // 2
-        print(self.colors.format_text('CYAN', '=') + ' ' * padding + 
-              self.colors.bold(title_line) + ' ' * padding + 
-              self.colors.format_text('CYAN', '='))
+        lines.append(edge + ' ' * padding + self.colors.bold(title_line) + ' ' * padding + edge)
         
         if subtitle:
             subtitle_line = f"  {subtitle}  "
             padding = (width - len(subtitle_line)) // 2
-            print(self.colors.format_text('CYAN', '=') + ' ' * padding + 
-                  self.colors.dim(subtitle_line) + ' ' * padding + 
-                  self.colors.format_text('CYAN', '='))
+            lines.append(edge + ' ' * padding + self.colors.dim(subtitle_line) + ' ' * padding + edge)
         
-        print(self.colors.format_text('CYAN', '=' * width))
-        print()
+        lines += [rule, "", ""]
+        sys.stdout.write("\n".join(lines))
     
     def print_section(self, title: str):
         """Print a section header"""
@@ -527,14 +695,16 @@ class UIEnhancer:
     
     def print_model_info(self, model: str, model_config: Dict[str, Any]):
         """Print formatted model information"""
+        bold = self.colors.bold
+        name, description = model_config['name'], model_config['description']
         print(f"{self.colors.highlight('Model Information:')}")
-        print(f"  {self.colors.bold('Name:')} {model_config['name']} ({model})")
-        print(f"  {self.colors.bold('Description:')} {model_config['description']}")
+        print(f"  {bold('Name:')} {name} ({model})")
+        print(f"  {bold('Description:')} {description}")
         
         # Reasoning timeouts
         timeouts = model_config.get('reasoning_timeout', {})
         if timeouts:
-            print(f"  {self.colors.bold('Timeouts:')}")
+            print(f"  {bold('Timeouts:')}")
             for effort, timeout in timeouts.items():
                 mins = timeout // 60
                 secs = timeout % 60
@@ -543,7 +713,7 @@ class UIEnhancer:
         # Pricing info
         pricing = model_config.get('pricing', {})
         if pricing:
-            print(f"  {self.colors.bold('Pricing:')}")
+            print(f"  {bold('Pricing:')}")
             print(f"    Input: ${pricing.get('input', 0):.4f} per 1K tokens")
             print(f"    Output: ${pricing.get('output', 0):.4f} per 1K tokens")
     
@@ -557,7 +727,13 @@ class UIEnhancer:
         bar = '█' * filled + '░' * (width - filled)
         percentage = int(progress * 100)
         
-        print(f"\r{self.colors.format_text('GREEN', bar)} {percentage}% ({current}/{total})", end='', flush=True)
+        # One write per visible change; repeated updates with the same text are skipped
+        line = f"\r{self.colors.green_code}{bar}{self.colors.reset_code} {percentage}% ({current}/{total})"
+        if line != self._last_progress_line:
+            sys.stdout.write(line)
+            sys.stdout.flush()
+        # A finished bar never suppresses the first frame of the next one
+        self._last_progress_line = line if current < total else None
     
     def print_table(self, headers: List[str], rows: List[List[str]], title: str = ""):
         """Print a formatted table"""
@@ -571,54 +747,143 @@ class UIEnhancer:
                 if i < len(widths):
                     widths[i] = max(widths[i], len(str(cell)))
         
+        # Lines are collected and written at once
+        lines = []
+        
         # Print title
         if title:
             total_width = sum(widths) + len(widths) * 3 - 1
-            print(f"\n{self.colors.highlight(title)}")
-            print(self.colors.dim('─' * total_width))
+            lines.append(f"\n{self.colors.highlight(title)}")
+            lines.append(self.colors.dim('─' * total_width))
+        
+        # Header and separator only depend on the headers and column widths
+        key = (tuple(headers), tuple(widths))
+        cached = self._table_cache.get(key)
+        if cached is None:
+            header_row = " │ ".join(headers[i].ljust(widths[i]) for i in range(len(headers)))
+            separator = "─┼─".join('─' * width for width in widths)
+            cached = self._table_cache[key] = (header_row, separator)
+        header_row, separator = cached
         
         # Print header
-        header_row = " │ ".join(headers[i].ljust(widths[i]) for i in range(len(headers)))
-        print(f"{self.colors.bold(header_row)}")
+        lines.append(self.colors.bold(header_row))
         
         # Print separator
-        separator = "─┼─".join('─' * width for width in widths)
-        print(self.colors.dim(separator))
+        lines.append(self.colors.dim(separator))
         
         # Print rows
         for row in rows:
             formatted_row = " │ ".join(str(row[i]).ljust(widths[i]) if i < len(row) else " " * widths[i] 
                                      for i in range(len(widths)))
-            print(formatted_row)
+            lines.append(formatted_row)
+        
+        lines.append("")
+        sys.stdout.write("\n".join(lines))
     
     def print_loading_animation(self, message: str, duration: float = 2.0):
         """Print a loading animation"""
-        import time
-        
         frames = ['⠋', '⠙', '⠹', '⠸', '⠼', '⠴', '⠦', '⠧', '⠇', '⠏']
+        cyan, reset = self.colors.cyan_code, self.colors.reset_code
+        lines = [f"\r{cyan}{frame}{reset} {message}" for frame in frames]
         end_time = time.time() + duration
         
         while time.time() < end_time:
-            for frame in frames:
+            for line in lines:
                 if time.time() >= end_time:
                     break
-                print(f"\r{self.colors.format_text('CYAN', frame)} {message}", end='', flush=True)
+                sys.stdout.write(line)
+                sys.stdout.flush()
                 time.sleep(0.1)
         
         print(f"\r{self.colors.success('✓')} {message}")
 
 
+class StreamPrinter:
+    """Coalesce streamed text chunks into few terminal writes"""
+    
+    def __init__(self, stream=None, max_chars: int = 512, max_delay: float = 0.05):
+        self.stream = stream
+        self.max_chars = max_chars
+        self.max_delay = max_delay
+        self._parts: List[str] = []
+        self._size = 0
+        self._last_flush = time.monotonic()
+        
+    def write(self, text: str):
+        """Buffer a chunk, writing the batch once it is large or old enough"""
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.max_chars or time.monotonic() - self._last_flush >= self.max_delay:
+            self.flush()
+            
+    def flush(self):
+        """Write and flush everything buffered so far"""
+        stream = self.stream or sys.stdout
+        if self._parts:
+            stream.write("".join(self._parts))
+            self._parts.clear()
+            self._size = 0
+        stream.flush()
+        self._last_flush = time.monotonic()
+        
+    def __enter__(self) -> 'StreamPrinter':
+        return self
+        
+    def __exit__(self, *exc_info):
+        self.flush()
+
+
+class LineReader:
+    """Read chat input lines with a fixed prompt, picking the cheapest reader for the terminal"""
+    
+    def __init__(self, prompt: str):
+        self.prompt = prompt
+        self._session = None
+        self._interactive = sys.stdin.isatty() and sys.stdout.isatty()
+        
+        if self._interactive:
+            try:
+                from prompt_toolkit import PromptSession
+                from prompt_toolkit.formatted_text import ANSI
+                # One session for the whole chat; the prompt is parsed once
+                self._session = PromptSession(ANSI(prompt))
+            except Exception:
+                # Optional dependency (or unusable terminal) - fall back to input()
+                self._session = None
+    
+    def read(self) -> str:
+        """Read one line without its newline, raising EOFError at end of input"""
+        if self._session is not None:
+            return self._session.prompt()
+        if self._interactive:
+            return input(self.prompt)
+        
+        # Piped input needs no line editing
+        sys.stdout.write(self.prompt)
+        sys.stdout.flush()
+        line = sys.stdin.readline()
+        if not line:
+            raise EOFError
+        return line.rstrip("\r\n")
+
+
 class ValidationUtils:
     """Validation utilities for various inputs and configurations"""
     
+    # Alphanumeric, hyphens, and underscores; \Z also rejects a trailing newline
+    AGENT_ID_PATTERN = re.compile(r'\A[a-zA-Z0-9_-]+\Z')
+    UNSAFE_FILENAME_TABLE = str.maketrans(dict.fromkeys('<>:"/\\|?*', '_'))
+    
+    REASONING_EFFORTS = frozenset({"low", "medium", "high"})
+    EXPORT_FORMATS = frozenset({"json", "txt", "md", "html", "csv", "xml"})
+    
     @staticmethod
     def validate_agent_id(agent_id: str) -> bool:
         """Validate agent ID format"""
         if not agent_id:
             return False
         
-        # Allow alphanumeric, hyphens, and underscores
-        return re.match(r'^[a-zA-Z0-9_-]+$', agent_id) is not None
+        return ValidationUtils.AGENT_ID_PATTERN.match(agent_id) is not None
     
     @staticmethod
     def validate_temperature(temperature: float) -> bool:
@@ -628,24 +893,249 @@ class ValidationUtils:
     @staticmethod
     def validate_reasoning_effort(effort: str) -> bool:
         """Validate reasoning effort"""
-        return effort in ["low", "medium", "high"]
+        return effort in ValidationUtils.REASONING_EFFORTS
     
     @staticmethod
     def validate_export_format(format_type: str) -> bool:
         """Validate export format"""
-        return format_type in ["json", "txt", "md", "html", "csv", "xml"]
+        return format_type in ValidationUtils.EXPORT_FORMATS
     
     @staticmethod
     def sanitize_filename(filename: str) -> str:
         """Sanitize filename for safe file operations"""
-        # Remove or replace unsafe characters
-        sanitized = re.sub(r'[<>:"/\\|?*]', '_', filename)
-        # Remove any path separators
-        sanitized = sanitized.replace('..', '_')
-        # Limit length
-        if len(sanitized) > 255:
-            sanitized = sanitized[:255]
-        return sanitized
+        # Replace unsafe characters, remove any path separators, limit length
+        return filename.translate(ValidationUtils.UNSAFE_FILENAME_TABLE).replace('..', '_')[:255]
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_line(obj: Any) -> bytes:
+    """Serialize an object to a single newline-terminated UTF-8 JSON line"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode('utf-8')
+
+
+def _iter_jsonl_lines(f, name: str) -> Iterator[Dict[str, Any]]:
+    """Parse JSONL lines, skipping an unterminated last line that does not parse"""
+    for line in f:
+        if line.strip():
+            try:
+                yield json_loads(line)
+            except ValueError:
+                # Only a write cut short (e.g. by a crash) leaves a line without its newline
+                if line.endswith(b'\n'):
+                    raise
+                logging.getLogger(__name__).warning(f"Skipping torn last line of {name}")
+
+
+def read_history_file(history_file: Path) -> List[Dict[str, Any]]:
+    """Read a history file in JSON Lines (or legacy JSON array) format"""
+    with open(history_file, 'rb') as f:
+        if history_file.suffix == ".json":
+            return json_loads(f.read())
+        return list(_iter_jsonl_lines(f, str(history_file)))
+
+
+def iter_history_file(history_file: Path) -> Iterator[Dict[str, Any]]:
+    """Yield messages from a history file one at a time without loading all of a JSONL file"""
+    if history_file.suffix == ".json":
+        yield from read_history_file(history_file)
+        return
+    with open(history_file, 'rb') as f:
+        yield from _iter_jsonl_lines(f, str(history_file))
+
+
+def repair_history_tail(history_file: Path) -> Optional[bytes]:
+    """End a JSONL file with a newline, cutting off a torn last line; returns the removed bytes"""
+    with open(history_file, 'r+b') as f:
+        end = f.seek(0, os.SEEK_END)
+        if end == 0:
+            return None
+        f.seek(end - 1)
+        if f.read(1) == b'\n':
+            return None
+        
+        # Walk back to the start of the unterminated last line
+        start = pos = end
+        tail = b""
+        while pos > 0:
+            step = min(64 * 1024, pos)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+            newline = tail.rfind(b'\n')
+            if newline >= 0:
+                start = pos + newline + 1
+                break
+        else:
+            start = 0
+        fragment = tail[start - pos:]
+        
+        try:
+            json_loads(fragment)
+        except ValueError:
+            f.truncate(start)
+            return fragment
+        
+        # A complete record that only lost its newline is kept
+        f.seek(end)
+        f.write(b'\n')
+        return None
+
+
+# Summary of history.jsonl kept next to it so listings need not parse the history
+HISTORY_META_FILE = "history.meta.json"
+
+
+def new_history_meta() -> Dict[str, Any]:
+    """Empty history summary"""
+    return {"count": 0, "user_count": 0, "assistant_count": 0, "total_chars": 0,
+            "first_ts": None, "last_ts": None}
+
+
+def add_to_history_meta(meta: Dict[str, Any], message: Dict[str, Any]):
+    """Account for one more message in a history summary"""
+    role = message.get("role")
+    if role == "user":
+        meta["user_count"] += 1
+    elif role == "assistant":
+        meta["assistant_count"] += 1
+    meta["count"] += 1
+    meta["total_chars"] += len(message.get("content", ""))
+    if meta["first_ts"] is None:
+        meta["first_ts"] = message.get("timestamp")
+    meta["last_ts"] = message.get("timestamp")
+
+
+def history_meta(messages: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Summarize messages (a list or a stream) into counts, characters and first/last timestamps"""
+    count = user_count = assistant_count = total_chars = 0
+    first_ts = last_ts = None
+    
+    # One fused pass with local counters instead of a pass per statistic
+    for message in messages:
+        role = message.get("role")
+        if role == "user":
+            user_count += 1
+        elif role == "assistant":
+            assistant_count += 1
+        total_chars += len(message.get("content", ""))
+        last_ts = message.get("timestamp")
+        if not count:
+            first_ts = last_ts
+        count += 1
+        
+    return {"count": count, "user_count": user_count, "assistant_count": assistant_count,
+            "total_chars": total_chars, "first_ts": first_ts, "last_ts": last_ts}
+
+
+def save_history_meta(history_file: Path, meta: Dict[str, Any]):
+    """Write the history summary, stamped with the history file's current size and mtime"""
+    stat = os.stat(history_file)
+    meta_file = history_file.with_name(HISTORY_META_FILE)
+    temp = meta_file.with_name(f"{HISTORY_META_FILE}.tmp")
+    
+    with open(temp, 'w', encoding='utf-8') as f:
+        json.dump({**meta, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}, f)
+    os.replace(temp, meta_file)
+
+
+def load_history_meta(history_file: Path, stat: Optional[os.stat_result] = None) -> Dict[str, Any]:
+    """Summarize a history file, from its sidecar when it is current, else by streaming it"""
+    if history_file.suffix == ".jsonl":
+        try:
+            if stat is None:
+                stat = os.stat(history_file)
+            with open(history_file.with_name(HISTORY_META_FILE), 'rb') as f:
+                meta = json_loads(f.read())
+            if meta.get("size") == stat.st_size and meta.get("mtime_ns") == stat.st_mtime_ns:
+                return meta
+        except (OSError, ValueError, AttributeError):
+            pass
+    return history_meta(iter_history_file(history_file))
+
+
+# Full-text index of message contents kept next to history.jsonl
+HISTORY_FTS_FILE = "history.fts.db"
+
+
+class HistoryIndex:
+    """SQLite FTS5 index over a conversation's messages, keyed by their position in the history"""
+    
+    def __init__(self, db_file: Path):
+        import sqlite3
+        
+        self._conn = sqlite3.connect(str(db_file), check_same_thread=False)
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS history_fts "
+            "USING fts5(content, role UNINDEXED, timestamp UNINDEXED)"
+        )
+        
+    def sync(self, messages: List[Dict[str, Any]]):
+        """Bring the index up to date with messages, appending new ones or rebuilding if they diverged"""
+        conn = self._conn
+        count = conn.execute("SELECT count(*) FROM history_fts").fetchone()[0]
+        
+        # Rows are only ever appended, so a matching last row means a matching prefix
+        if count:
+            row = conn.execute("SELECT role, timestamp FROM history_fts WHERE rowid = ?", (count - 1,)).fetchone()
+            last = messages[count - 1] if count <= len(messages) else None
+            if row is None or last is None or row != (last.get("role"), last.get("timestamp")):
+                count = -1
+                
+        if count == len(messages):
+            return
+        with conn:
+            if count < 0:
+                conn.execute("DELETE FROM history_fts")
+                count = 0
+            conn.executemany(
+                "INSERT INTO history_fts (rowid, content, role, timestamp) VALUES (?, ?, ?, ?)",
+                ((i, messages[i].get("content", ""), messages[i].get("role"), messages[i].get("timestamp"))
+                 for i in range(count, len(messages)))
+            )
+            
+    def search(self, term: str, limit: int = 50) -> List[Tuple[int, str]]:
+        """Return (position, snippet) for messages matching term, best BM25 match first"""
+        # Quote the term as one phrase so user input is never parsed as query syntax;
+        # the trailing * lets the last word match as a prefix
+        query = '"' + term.replace('"', '""') + '"*'
+        return self._conn.execute(
+            "SELECT rowid, snippet(history_fts, 0, '', '', '...', 16) FROM history_fts "
+            "WHERE history_fts MATCH ? ORDER BY bm25(history_fts) LIMIT ?",
+            (query, limit)
+        ).fetchall()
+        
+    def close(self):
+        """Close the index database"""
+        self._conn.close()
+
+
+# Canonical ISO 8601 timestamps ("YYYY-MM-DDTHH:MM:SS..."), which can be reformatted by slicing
+_ISO_TIMESTAMP_RE = re.compile(r'\d{4}-\d\d-\d\d[T ]\d\d:\d\d:\d\d')
+
+_ISO_SLICES = {
+    "%H:%M:%S": lambda ts: ts[11:19],
+    "%m-%d %H:%M": lambda ts: f"{ts[5:10]} {ts[11:16]}",
+    "%Y-%m-%d %H:%M:%S": lambda ts: f"{ts[:10]} {ts[11:19]}",
+}
+
+
+def format_timestamp(timestamp: str, fmt: str = "%H:%M:%S") -> str:
+    """Reformat an ISO timestamp, slicing canonical ones instead of parsing them"""
+    slicer = _ISO_SLICES.get(fmt)
+    if slicer is not None and _ISO_TIMESTAMP_RE.match(timestamp):
+        return slicer(timestamp)
+    return datetime.fromisoformat(timestamp).strftime(fmt)
+
+
+_SIZE_NAMES = ("B", "KB", "MB", "GB", "TB")
 
 
 def format_file_size(size_bytes: int) -> str:
@@ -653,13 +1143,9 @@ def format_file_size(size_bytes: int) -> str:
     if size_bytes == 0:
         return "0B"
     
-    size_names = ["B", "KB", "MB", "GB", "TB"]
-    i = 0
-    while size_bytes >= 1024 and i < len(size_names) - 1:
-        size_bytes /= 1024.0
-        i += 1
-    
-    return f"{size_bytes:.1f}{size_names[i]}"
+    # Each unit is 10 more bits, so the bucket comes straight from the bit length
+    i = min((int(size_bytes).bit_length() - 1) // 10, 4) if size_bytes >= 1024 else 0
+    return f"{size_bytes / (1 << (i * 10)):.1f}{_SIZE_NAMES[i]}"
 
 
 def format_duration(seconds: float) -> str:
@@ -674,15 +1160,25 @@ def format_duration(seconds: float) -> str:
         return f"{hours:.1f}h"
 
 
-def get_system_info() -> Dict[str, str]:
-    """Get system information for debugging"""
+@lru_cache(maxsize=None)
+def _static_system_info() -> Tuple[Tuple[str, str], ...]:
+    """Platform details that cannot change while the process runs"""
+    # Only needed for debug output, and this runs once per process
     import platform
     
+    return (
+        ("platform", platform.system()),
+        ("platform_version", platform.version()),
+        ("python_version", platform.python_version()),
+        ("architecture", platform.architecture()[0]),
+    )
+
+
+def get_system_info() -> Dict[str, str]:
+    """Get system information for debugging"""
+    # Only the terminal width and stdout encoding are looked up on every call
     return {
-        "platform": platform.system(),
-        "platform_version": platform.version(),
-        "python_version": platform.python_version(),
-        "architecture": platform.architecture()[0],
+        **dict(_static_system_info()),
         "terminal_width": str(os.get_terminal_size().columns if hasattr(os, 'get_terminal_size') else "unknown"),
         "encoding": sys.stdout.encoding or "unknown"
     }
\ No newline at end of file